@@ -1,56 +1,263 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from database import get_all_predictions
+from database import get_all_predictions, get_prediction_summary, get_daily_summary, query_predictions, get_write_behind_stats
+from batch_scoring import score_roster
+from prediction_export import FORMATS, export_bytes
+from query_cache import cached, cache_stats
+from provisioning import provision_file
+import metrics
+from prediction_cache import prediction_cache_stats
+import drift
+
+# Column names for clean display
+COLUMN_LABELS = {
+    "id": "Prediction ID",
+    "username": "Student",
+    "cgpa": "CGPA",
+    "internships": "Internships",
+    "projects": "Projects",
+    "workshops": "Workshops / Certs",
+    "aptitude_score": "Aptitude Score",
+    "soft_skills": "Soft Skills",
+    "extracurricular": "Extracurricular",
+    "placement_training": "Placement Training",
+    "ssc_marks": "SSC (%)",
+    "hsc_marks": "HSC (%)",
+    "placement_status": "Placed",
+    "predicted_at": "Predicted At"
+}
+
+def to_display_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows).rename(columns=COLUMN_LABELS)
+
+    # Convert boolean-like fields for better readability
+    df["Placed"] = df["Placed"].map({1: "Yes", 0: "No"})
+    df["Extracurricular"] = df["Extracurricular"].map({1: "Yes", 0: "No"})
+    df["Placement Training"] = df["Placement Training"].map({1: "Yes", 0: "No"})
+    return df
 
 def admin_dashboard():
     st.title("📊 Admin Dashboard – Placement Insights")
     st.caption("Overview of all student placement predictions")
 
-    # Fetch all prediction records (with username joined)
-    data = get_all_predictions()
+    tab_insights, tab_cohort, tab_accounts, tab_drift, tab_health = st.tabs([
+        "📈 Insights", "🗂️ Bulk Cohort Scoring", "👥 Student Accounts", "📉 Input Drift", "🩺 System Health"
+    ])
 
-    if not data:
-        st.info("No predictions have been made yet.")
+    with tab_insights:
+        render_insights()
+
+    with tab_cohort:
+        render_cohort_scoring()
+
+    with tab_accounts:
+        render_provisioning()
+
+    with tab_drift:
+        render_drift()
+
+    with tab_health:
+        render_system_health()
+
+def render_drift():
+    st.subheader("Input Drift")
+    st.caption(
+        f"Student profiles submitted in the last {drift.WINDOW_MONTHS} calendar months compared with the training data. "
+        f"Alerts when PSI ≥ {drift.PSI_ALERT:g} or KS ≥ {drift.KS_ALERT:g} "
+        f"once a feature has {drift.MIN_LIVE_ROWS:,} live rows; PSI ≥ {drift.PSI_WATCH:g} is worth watching."
+    )
+
+    try:
+        report = drift.drift_report()
+    except Exception as e:
+        st.error(f"Could not compute drift: {str(e)}")
         return
 
-    df = pd.DataFrame(data)
-
-    # Rename columns for clean display
-    df = df.rename(columns={
-        "id": "Prediction ID",
-        "username": "Student",
-        "cgpa": "CGPA",
-        "internships": "Internships",
-        "projects": "Projects",
-        "workshops": "Workshops / Certs",
-        "aptitude_score": "Aptitude Score",
-        "soft_skills": "Soft Skills",
-        "extracurricular": "Extracurricular",
-        "placement_training": "Placement Training",
-        "ssc_marks": "SSC (%)",
-        "hsc_marks": "HSC (%)",
-        "placement_status": "Placed",
-        "predicted_at": "Predicted At"
-    })
+    if report.empty:
+        st.info(f"No predictions logged in the last {drift.WINDOW_MONTHS} months.")
+        return
 
-    # Convert boolean-like fields for better readability
-    df["Placed"] = df["Placed"].map({1: "Yes", 0: "No"})
-    df["Extracurricular"] = df["Extracurricular"].map({1: "Yes", 0: "No"})
-    df["Placement Training"] = df["Placement Training"].map({1: "Yes", 0: "No"})
+    alerts = report[report["Status"] == "alert"]
+    for _, row in alerts.iterrows():
+        st.error(
+            f"**{row['Feature']}** has drifted: PSI {row['PSI']:.3f}, KS {row['KS']:.3f}, "
+            f"mean {row['Training Mean']:.2f} → {row['Live Mean']:.2f}"
+        )
+    if alerts.empty:
+        st.success("No feature is above the drift thresholds.")
+
+    st.dataframe(
+        report,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Live Rows": st.column_config.NumberColumn("Live Rows", format="%d"),
+            "Training Mean": st.column_config.NumberColumn("Training Mean", format="%.2f"),
+            "Live Mean": st.column_config.NumberColumn("Live Mean", format="%.2f"),
+            "Shift (SD)": st.column_config.NumberColumn("Shift (SD)", format="%+.2f"),
+            "PSI": st.column_config.NumberColumn("PSI", format="%.3f"),
+            "KS": st.column_config.NumberColumn("KS", format="%.3f"),
+            "PSI (All Time)": st.column_config.NumberColumn("PSI (All Time)", format="%.3f"),
+        }
+    )
+
+def render_system_health():
+    st.subheader("System Health")
+    if not metrics.ENABLED:
+        st.info("Instrumentation is off (METRICS_ENABLED=0).")
+        return
+    st.caption("Timings for this app process since it started. Percentiles are estimated from histogram buckets.")
+
+    stages = metrics.snapshot()
+    if stages:
+        st.dataframe(
+            pd.DataFrame(stages),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "stage": "Stage",
+                "count": "Calls",
+                "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+                "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+                "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.2f"),
+                "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.2f"),
+                "total_s": st.column_config.NumberColumn("Total (s)", format="%.2f"),
+            }
+        )
+    else:
+        st.info("Nothing recorded yet.")
+
+    col1, col2, col3 = st.columns(3)
+    prediction_cache = prediction_cache_stats()
+    read_cache = cache_stats()
+    col1.metric("Prediction cache hit rate", f"{prediction_cache['hit_rate']:.0%}",
+                help=f"{prediction_cache['entries']:,} entries, {prediction_cache['evictions']:,} evictions")
+    col2.metric("Dashboard cache hit rate", f"{read_cache['hit_rate']:.0%}",
+                help=f"{read_cache['entries']:,} entries")
+    col3.metric("Queued prediction writes", get_write_behind_stats().get("queue_depth", 0))
+
+    st.markdown(f"**Slow queries** (over {metrics.SLOW_QUERY_MS:g} ms)")
+    slow = metrics.slow_queries()
+    if not slow:
+        st.caption("None recorded.")
+    for entry in slow[:20]:
+        with st.expander(f"{entry['ms']:.1f} ms • {entry['at']} • {entry['sql'][:80]}"):
+            st.code(entry["sql"], language="sql")
+            if entry["plan"]:
+                st.code("\n".join(entry["plan"]), language="text")
+
+    st.download_button(
+        "Download Prometheus metrics",
+        data=metrics.prometheus_text(),
+        file_name="placement_metrics.prom",
+        mime="text/plain"
+    )
+
+def render_provisioning():
+    st.subheader("Provision Student Accounts")
+    st.caption(
+        "Upload a roster as CSV (username,password header) or JSONL "
+        "({\"username\": ..., \"password\": ...} per line). Existing usernames are skipped."
+    )
+
+    with st.form("provision_form", clear_on_submit=True):
+        roster = st.file_uploader("Roster file", type=["csv", "jsonl"])
+        submitted = st.form_submit_button("Create Accounts", type="primary", use_container_width=True)
+
+    if submitted:
+        if roster is None:
+            st.warning("Please upload a roster file")
+            return
+
+        fmt = "jsonl" if roster.name.lower().endswith(".jsonl") else "csv"
+        with st.spinner("Hashing passwords and creating accounts..."):
+            try:
+                report = provision_file(roster.getvalue(), fmt)
+            except Exception as e:
+                st.error(f"Provisioning failed: {str(e)}")
+                return
+
+        skipped = len(report["duplicates"]) + report["skipped_at_insert"]
+        st.success(f"Created {report['created']:,} accounts")
+        cols = st.columns(3)
+        cols[0].metric("Created", f"{report['created']:,}")
+        cols[1].metric("Duplicates Skipped", f"{skipped:,}")
+        cols[2].metric("Throughput", f"{report['accounts_per_second']:,.1f}/s")
+
+        problems = sorted(report["invalid"] + report["duplicates"])
+        if problems:
+            st.dataframe(
+                pd.DataFrame(problems, columns=["Line", "Username", "Reason"]),
+                use_container_width=True,
+                hide_index=True
+            )
+
+def render_cohort_scoring():
+    st.subheader("Score a Student Roster")
+    st.caption(
+        "Upload a CSV in the same layout as placementdata_with_company_tier.csv "
+        "(StudentID, CGPA, Internships, ... HSC_Marks). Results are stored as one batch."
+    )
+
+    with st.form("cohort_form", clear_on_submit=True):
+        roster = st.file_uploader("Roster CSV", type=["csv"])
+        batch_id = st.text_input("Batch label (optional)", placeholder="e.g. MCA-2026")
+        submitted = st.form_submit_button("Score Roster", type="primary", use_container_width=True)
+
+    if submitted:
+        if roster is None:
+            st.warning("Please upload a roster CSV")
+            return
+
+        with st.spinner("Scoring roster..."):
+            try:
+                stats = score_roster(roster, batch_id=batch_id.strip() or None)
+            except Exception as e:
+                st.error(f"Bulk scoring failed: {str(e)}")
+                return
+
+        if stats["inserted"] != stats["rows"]:
+            st.error("Scoring finished but the results could not be saved")
+            return
+
+        st.success(f"Batch **{stats['batch_id']}** scored and saved")
+        cols = st.columns(3)
+        cols[0].metric("Students Scored", f"{stats['rows']:,}")
+        cols[1].metric("Predicted Placed", f"{stats['placed']:,}")
+        cols[2].metric("Throughput", f"{stats['rows_per_second']:,.0f} rows/s")
+
+def render_insights():
+    # plotly is only needed here; importing it lazily keeps it off the login
+    # and student pages
+    import plotly.express as px
+
+    # Headline numbers come from the rollup tables and cover every prediction
+    summary = cached("prediction_summary", get_prediction_summary)
+
+    if summary["total"] == 0:
+        st.info("No predictions have been made yet.")
+        return
+
+    # Fetch the latest prediction records (with username joined) for charts and table
+    df = cached("recent_predictions_frame", recent_predictions_frame)
+    if df is None:
+        st.info("No predictions have been made yet.")
+        return
 
     # ── Key Metrics ───────────────────────────────────────────────────────────
     cols = st.columns([1, 1, 1, 1])
 
-    total = len(df)
-    placed_count = (df["Placed"] == "Yes").sum()
-    placement_rate = placed_count / total if total > 0 else 0
-    unique_students = df["Student"].nunique()
+    cols[0].metric("Total Predictions", f"{summary['total']:,}")
+    cols[1].metric("Students Placed", f"{summary['placed']:,}", delta_color="normal")
+    cols[2].metric("Placement Rate", f"{summary['placement_rate']:.1%}")
+    cols[3].metric("Unique Students", f"{summary['students']:,}")
 
-    cols[0].metric("Total Predictions", f"{total:,}")
-    cols[1].metric("Students Placed", f"{placed_count:,}", delta_color="normal")
-    cols[2].metric("Placement Rate", f"{placement_rate:.1%}")
-    cols[3].metric("Unique Students", unique_students)
+    means = summary["means"]
+    cols = st.columns([1, 1, 1, 1])
+    cols[0].metric("Avg CGPA", f"{means['cgpa']:.2f}")
+    cols[1].metric("Avg Aptitude", f"{means['aptitude_score']:.1f}")
+    cols[2].metric("Avg Internships", f"{means['internships']:.1f}")
+    cols[3].metric("Attended Training", f"{means['placement_training']:.0%}")
 
     # ── Visualizations ────────────────────────────────────────────────────────
     st.subheader("Placement Overview")
@@ -58,9 +265,14 @@ def admin_dashboard():
     tab_overview, tab_by_cgpa = st.tabs(["Summary", "CGPA & Aptitude"])
 
     with tab_overview:
+        outcome = pd.DataFrame({
+            "Placed": ["Yes", "No"],
+            "Predictions": [summary["placed"], summary["total"] - summary["placed"]]
+        })
         fig_pie = px.pie(
-            df, 
-            names="Placed", 
+            outcome,
+            names="Placed",
+            values="Predictions",
             title="Placed vs Not Placed",
             color="Placed",
             color_discrete_map={"Yes": "#22c55e", "No": "#ef4444"}
@@ -68,7 +280,22 @@ def admin_dashboard():
         fig_pie.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig_pie, use_container_width=True)
 
+        daily = cached("daily_summary", get_daily_summary)
+        daily = pd.DataFrame(daily)
+        if not daily.empty:
+            daily["Placement Rate"] = daily["placed"] / daily["total"]
+            fig_daily = px.bar(
+                daily,
+                x="day",
+                y="total",
+                hover_data={"Placement Rate": ":.1%"},
+                labels={"day": "Day", "total": "Predictions"},
+                title="Predictions per Day"
+            )
+            st.plotly_chart(fig_daily, use_container_width=True)
+
     with tab_by_cgpa:
+        st.caption(f"Latest {len(df):,} predictions")
         fig_scatter = px.scatter(
             df,
             x="CGPA",
@@ -83,29 +310,104 @@ def admin_dashboard():
         st.plotly_chart(fig_scatter, use_container_width=True)
 
     # ── Data Table ────────────────────────────────────────────────────────────
+    render_prediction_browser()
+
+def read_browser_filters() -> dict:
+    with st.form("browser_filter_form"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            student = st.text_input("Student (username)")
+            outcome = st.selectbox("Outcome", ["All", "Placed", "Not placed"])
+        with col2:
+            dates = st.date_input("Date range", value=[])
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+        with col3:
+            cgpa = st.slider("CGPA", 0.0, 10.0, (0.0, 10.0), step=0.1)
+            aptitude = st.slider("Aptitude Score", 0, 100, (0, 100))
+        include_archive = st.checkbox(
+            "Include archived predictions",
+            help="Rows moved out of the live table by retention.py, read through the same indexes"
+        )
+
+        applied = st.form_submit_button("Apply Filters", use_container_width=True)
+
+    filters = {"student": student.strip() or None}
+    if len(dates) > 0:
+        filters["date_from"] = dates[0]
+        filters["date_to"] = dates[-1]
+    if cgpa != (0.0, 10.0):
+        filters["cgpa_min"], filters["cgpa_max"] = cgpa
+    if aptitude != (0, 100):
+        filters["aptitude_min"], filters["aptitude_max"] = aptitude
+    if outcome != "All":
+        filters["placed"] = 1 if outcome == "Placed" else 0
+
+    # New filters start again from the first page
+    if applied or "browser_cursors" not in st.session_state:
+        st.session_state.browser_filters = filters
+        st.session_state.browser_page_size = page_size
+        st.session_state.browser_include_archive = include_archive
+        st.session_state.browser_cursors = [None]
+
+    return st.session_state.browser_filters
+
+def query_page(filter_items: tuple, after, page_size: int, include_archive: bool):
+    # Filters travel as sorted items so they can be part of the cache key
+    return query_predictions(dict(filter_items), after, page_size, include_archive)
+
+def recent_predictions_frame() -> pd.DataFrame | None:
+    data = get_all_predictions()
+    return to_display_frame(data) if data else None
+
+def render_prediction_browser():
     st.subheader("All Prediction Records")
 
-    st.dataframe(
-        df.style
-          .format({
-              "CGPA": "{:.2f}",
-              "Soft Skills": "{:.1f}",
-              "SSC (%)": "{:.1f}",
-              "HSC (%)": "{:.1f}",
-              "Predicted At": lambda x: pd.to_datetime(x).strftime("%Y-%m-%d %H:%M")
-          })
-          .highlight_max(subset="CGPA", color="#d1fae5")
-          .highlight_min(subset="CGPA", color="#fee2e2"),
-        use_container_width=True,
-        hide_index=True
+    filters = read_browser_filters()
+    include_archive = st.session_state.browser_include_archive
+    cursors = st.session_state.browser_cursors
+    rows, next_cursor = cached(
+        "prediction_page", query_page,
+        tuple(sorted(filters.items())), cursors[-1], st.session_state.browser_page_size, include_archive
     )
 
-    # Download option
-    csv = df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        "📥 Download all predictions (CSV)",
-        data=csv,
-        file_name="placement_predictions_export.csv",
-        mime="text/csv",
+    if not rows:
+        st.info("No predictions match these filters.")
+    else:
+        st.dataframe(
+            to_display_frame(rows),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "CGPA": st.column_config.NumberColumn("CGPA", format="%.2f"),
+                "Soft Skills": st.column_config.NumberColumn("Soft Skills", format="%.1f"),
+                "SSC (%)": st.column_config.NumberColumn("SSC (%)", format="%.1f"),
+                "HSC (%)": st.column_config.NumberColumn("HSC (%)", format="%.1f"),
+                "Predicted At": st.column_config.DatetimeColumn("Predicted At", format="YYYY-MM-DD HH:mm"),
+            }
+        )
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    if col_prev.button("← Newer", disabled=len(cursors) == 1, use_container_width=True):
+        cursors.pop()
+        st.rerun()
+    col_page.caption(f"Page {len(cursors)}")
+    if col_next.button("Older →", disabled=next_cursor is None, use_container_width=True):
+        cursors.append(next_cursor)
+        st.rerun()
+
+    # Download option: the export is built only when the button is clicked,
+    # with the same filters as the table above, and held in memory
+    col_fmt, col_dl = st.columns([1, 3])
+    fmt = col_fmt.selectbox("Format", list(FORMATS), label_visibility="collapsed")
+    mime, extension = FORMATS[fmt]
+    col_dl.download_button(
+        "📥 Download matching predictions",
+        data=lambda: export_bytes(fmt, filters, include_archive),
+        file_name=f"placement_predictions_export.{extension}",
+        mime=mime,
         use_container_width=True
-    )
\ No newline at end of file
+    )
+    st.caption(
+        "For the full history or very large exports, use the command line: "
+        "`python app/prediction_export.py predictions.parquet`"
+    )
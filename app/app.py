@@ -1,7 +1,11 @@
 import streamlit as st
 from auth import login, register_user
-from user_dashboard import user_dashboard
-from admin_dashboard import admin_dashboard
+from database import ensure_schema
+from metrics import timer
+
+# The dashboards (pandas, plotly, pyarrow, model registry) are imported only
+# after login and only for the role being shown, so the login page renders
+# without them; Python caches the import for every later rerun
 
 st.set_page_config(
     page_title="Placement & Career Recommendation System",
@@ -10,6 +14,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed"  # hide on login page
 )
 
+ensure_schema()
+
 # Session state
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -33,7 +39,8 @@ if not st.session_state.logged_in:
     with tab_login:
         with st.container():
             st.markdown("<div style='padding: 1.5rem 1rem; background: #1e1e2e; border-radius: 12px;'>", unsafe_allow_html=True)
-            login()
+            with timer("page.login"):
+                login()
             st.markdown("</div>", unsafe_allow_html=True)
 
     with tab_register:
@@ -51,6 +58,10 @@ else:
             logout()
 
     if st.session_state.role == "admin":
-        admin_dashboard()
+        from admin_dashboard import admin_dashboard
+        with timer("page.admin_dashboard"):
+            admin_dashboard()
     else:
-        user_dashboard()
\ No newline at end of file
+        from user_dashboard import user_dashboard
+        with timer("page.user_dashboard"):
+            user_dashboard()
\ No newline at end of file
@@ -1,14 +1,7 @@
+import sqlite3
 import streamlit as st
-import bcrypt
-from database import get_connection, init_db
-
-init_db()
-
-def hash_password(password: str) -> bytes:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12))
-
-def verify_password(password: str, hashed: bytes) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed)
+from database import get_connection
+from password_pool import PasswordPoolBusy, hash_password, verify_and_rehash
 
 def login():
     with st.form("login_form", clear_on_submit=True):
@@ -44,7 +37,16 @@ def login():
                         )
                         user = cursor.fetchone()
 
-                    if user and verify_password(password, user["password"]):
+                    ok, new_hash = verify_and_rehash(password, user["password"]) if user else (False, None)
+
+                    if ok:
+                        # Stored hash used an older cost factor; upgrade it now
+                        # that we have the plaintext
+                        if new_hash is not None:
+                            with get_connection() as conn:
+                                conn.execute("UPDATE users SET password = ? WHERE id = ?", (new_hash, user["id"]))
+                                conn.commit()
+
                         st.session_state.logged_in = True
                         st.session_state.role = "user"
                         st.session_state.username = user["username"]
@@ -52,6 +54,8 @@ def login():
                         st.rerun()
                     else:
                         st.error("Invalid username or password")
+                except PasswordPoolBusy as e:
+                    st.warning(str(e))
                 except Exception as e:
                     st.error(f"Login error: {str(e)}")
 
@@ -98,5 +102,7 @@ def register_user():
                 st.success("Account created! Please log in.")
             except sqlite3.IntegrityError:
                 st.error("Username already exists")
+            except PasswordPoolBusy as e:
+                st.warning(str(e))
             except Exception as e:
                 st.error(f"Registration failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,77 @@
+import argparse
+import sys
+import time
+import uuid
+from typing import Any, Dict, Iterator
+
+import pandas as pd
+
+from database import init_db, insert_cohort_predictions
+from inference import predict_batch, prepare_features
+from model_registry import get_placement_scorer, get_tier_predictor
+
+DEFAULT_CHUNKSIZE = 5000
+
+def _score_chunks(source, batch_id: str, chunksize: int, stats: Dict[str, Any]) -> Iterator[tuple]:
+    placement_scorer = get_placement_scorer()
+    tier_predictor = get_tier_predictor()
+
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        try:
+            X = prepare_features(chunk)
+            placed, prob, tiers = predict_batch(placement_scorer, tier_predictor, X.to_numpy())
+        except Exception as e:
+            # Surfaced by score_roster; the open transaction is rolled back
+            stats["error"] = f"Rows {stats['rows'] + 1}-{stats['rows'] + len(chunk)}: {e}"
+            raise
+
+        if "StudentID" in chunk.columns:
+            student_ids = chunk["StudentID"].astype(str).tolist()
+        else:
+            student_ids = [None] * len(chunk)
+
+        stats["rows"] += len(chunk)
+        stats["placed"] += int(placed.sum())
+
+        features = X.itertuples(index=False, name=None)
+        for student_id, row, status, p, tier in zip(student_ids, features, placed.tolist(), prob.tolist(), tiers):
+            yield (batch_id, student_id, *row, status, p, tier)
+
+def score_roster(source, batch_id: str | None = None, chunksize: int = DEFAULT_CHUNKSIZE) -> Dict[str, Any]:
+    # source: path or file-like object in the data/raw CSV layout
+    batch_id = batch_id or uuid.uuid4().hex[:12]
+    stats = {"batch_id": batch_id, "rows": 0, "placed": 0}
+
+    # Any failure (bad cell, model load, database) aborts the whole batch:
+    # nothing is written, and the error names the rows when it came from them
+    start = time.perf_counter()
+    try:
+        stats["inserted"] = insert_cohort_predictions(_score_chunks(source, batch_id, chunksize, stats))
+    except Exception as e:
+        if "error" in stats:
+            raise ValueError(stats["error"]) from e
+        raise
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a student roster CSV with the placement and tier models")
+    parser.add_argument("csv", help="Roster CSV in the data/raw/placementdata_with_company_tier.csv layout")
+    parser.add_argument("--batch-id", default=None, help="Label stored with every scored row (default: random)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    init_db()
+    try:
+        stats = score_roster(args.csv, batch_id=args.batch_id, chunksize=args.chunksize)
+    except Exception as e:
+        sys.exit(f"Cannot score {args.csv}: {e}")
+    print(
+        f"Batch {stats['batch_id']}: scored {stats['rows']:,} students "
+        f"({stats['placed']:,} placed), wrote {stats['inserted']:,} rows "
+        f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/s)"
+    )
+
+if __name__ == "__main__":
+    main()
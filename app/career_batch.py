@@ -0,0 +1,196 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from career_recomm import SkillIndex, skill_index
+
+DEFAULT_CHUNKSIZE = 5000
+DEFAULT_TOP_K = 6
+FALLBACK = {
+    "title": "Explore High-Demand Fields",
+    "confidence": 50,
+    "reasons": "Add more specific skills or consider certifications in Data Analytics, Cloud, AI, Digital Marketing"
+}
+
+# ── Batch recommendations ────────────────────────────────────────────────────
+# Same scoring as career_recomm.recommend_career(), for a whole cohort at once:
+#   S  students x keywords  (sparse, 1 where the student mentions the keyword)
+#   K  keywords x groups    (1 where the keyword belongs to the group)
+#   S @ K gives per-group match counts; group scores are spread onto a
+#   students x titles matrix, interest and course boosts are added as masks,
+#   and each row is ranked with the same tie order as the per-student version.
+# Scores are added in the same order as recommend_career(), so confidences are
+# identical. Reasons are joined in a fixed order instead of set order.
+
+class BatchRecommender:
+    def __init__(self, index: SkillIndex = skill_index):
+        self.index = index
+        self.keywords = list(index.keyword_groups)
+        self.keyword_pos = {k: i for i, k in enumerate(self.keywords)}
+        groups = index.groups
+
+        rows, cols = [], []
+        for k, kw_groups in index.keyword_groups.items():
+            for g in kw_groups:
+                rows.append(self.keyword_pos[k])
+                cols.append(groups.index(g))
+        self.K = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(self.keywords), len(groups))
+        )
+        self.group_sizes = np.array([index.group_sizes[g] for g in groups], dtype=np.float64)
+
+        # Title space: group titles first (in group order), then interest-only roles
+        self.titles = []
+        for g in groups:
+            if index.group_titles[g] not in self.titles:
+                self.titles.append(index.group_titles[g])
+        for roles in index.interest_map.values():
+            for role in roles:
+                if role not in self.titles:
+                    self.titles.append(role)
+        self.title_pos = {t: i for i, t in enumerate(self.titles)}
+
+        self.group_title = np.array([self.title_pos[index.group_titles[g]] for g in groups])
+        self.boosted = np.array([index.is_boosted(t) for t in self.titles])
+
+        # Interest -> (title mask, insertion position of each role)
+        self.interests = list(index.interest_map)
+        n_titles = len(self.titles)
+        self.interest_mask = np.zeros((len(self.interests) + 1, n_titles), dtype=bool)
+        self.interest_rank = np.full((len(self.interests) + 1, n_titles), np.iinfo(np.int32).max, dtype=np.int64)
+        for i, interest in enumerate(self.interests):
+            for pos, role in enumerate(index.interest_map[interest]):
+                self.interest_mask[i, self.title_pos[role]] = True
+                self.interest_rank[i, self.title_pos[role]] = len(groups) + pos
+
+        self._title_groups = [[gi for gi, t in enumerate(self.group_title) if t == ti] for ti in range(n_titles)]
+        self._group_labels = [g.replace("_", " ").title() for g in groups]
+
+        # Titles reached through a skill group are inserted at the group's position
+        self.skill_rank = np.full(n_titles, np.iinfo(np.int32).max, dtype=np.int64)
+        for gi, ti in enumerate(self.group_title):
+            self.skill_rank[ti] = min(self.skill_rank[ti], gi)
+
+    def encode(self, skills) -> sparse.csr_matrix:
+        indptr, indices = [0], []
+        for text in skills:
+            matched = self.index.match_skills(text if isinstance(text, str) else "")
+            indices.extend(self.keyword_pos[k] for k in matched)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.keywords)))
+
+    def recommend(self, courses, skills, interests, top_k: int = DEFAULT_TOP_K) -> list[list[dict]]:
+        n = len(skills)
+        counts = np.asarray((self.encode(skills) @ self.K).todense())          # students x groups
+
+        # Skill scores onto titles
+        scores = np.zeros((n, len(self.titles)))
+        present = np.zeros((n, len(self.titles)), dtype=bool)
+        group_scores = counts / self.group_sizes * 60
+        for gi, ti in enumerate(self.group_title):
+            matched = counts[:, gi] > 0
+            scores[matched, ti] += group_scores[matched, gi]
+            present[matched, ti] = True
+        rank = np.where(present, self.skill_rank, np.iinfo(np.int32).max)
+
+        # Interest boost
+        interest_pos = {interest: i for i, interest in enumerate(self.interests)}
+        interest_idx = np.array([interest_pos.get(i, len(self.interests)) for i in interests], dtype=np.int64)
+        interest_mask = self.interest_mask[interest_idx]
+        scores[interest_mask] += 70
+        rank = np.where(interest_mask & ~present, self.interest_rank[interest_idx], rank)
+        present |= interest_mask
+
+        # Course boost, one +25 per boosted group as in recommend_career()
+        boosts = np.array([len(self.index.course_boost.get(c, [])) for c in courses])
+        boosted = present & self.boosted
+        for step in range(1, boosts.max(initial=0) + 1):
+            scores[boosted & (boosts >= step)[:, None]] += 25
+        course_reason = boosted & (boosts > 0)[:, None]
+
+        confidence = np.minimum(np.round(scores), 100).astype(np.int64)
+        # Highest confidence first, ties in insertion order; absent titles last
+        order = np.lexsort((rank, np.where(present, -confidence, 1)), axis=1)[:, :top_k]
+
+        # Only the top-k titles per student need reasons; build them from plain lists
+        title_groups = self._title_groups
+        counts, present, confidence = counts.tolist(), present.tolist(), confidence.tolist()
+        interest_mask, course_reason = interest_mask.tolist(), course_reason.tolist()
+        results = []
+        for s, top in enumerate(order.tolist()):
+            recs = []
+            for ti in top:
+                if not present[s][ti]:
+                    break
+                reasons = [
+                    f"{self._group_labels[gi]} skills ({counts[s][gi]} match)"
+                    for gi in title_groups[ti] if counts[s][gi] > 0
+                ]
+                if interest_mask[s][ti]:
+                    reasons.append(f"Aligns with your interest: {interests[s]}")
+                if course_reason[s][ti]:
+                    reasons.append(f"Strong fit for {courses[s]} graduates")
+                recs.append({"title": self.titles[ti], "confidence": confidence[s][ti], "reasons": ", ".join(reasons)})
+            results.append(recs or [dict(FALLBACK)])
+        return results
+
+_recommender = None
+
+def recommend_chunk(chunk: pd.DataFrame, top_k: int = DEFAULT_TOP_K) -> pd.DataFrame:
+    # Long format: one row per (student, recommendation)
+    global _recommender
+    if _recommender is None:
+        _recommender = BatchRecommender()
+
+    ids = chunk["student_id"].tolist() if "student_id" in chunk.columns else chunk.index.tolist()
+    recs = _recommender.recommend(
+        chunk["course"].fillna("").tolist(),
+        chunk["skills"].fillna("").tolist(),
+        chunk["interest"].fillna("").tolist(),
+        top_k
+    )
+    rows = [
+        (student_id, rank, rec["title"], rec["confidence"], rec["reasons"])
+        for student_id, student_recs in zip(ids, recs)
+        for rank, rec in enumerate(student_recs, start=1)
+    ]
+    return pd.DataFrame(rows, columns=["student_id", "rank", "title", "confidence", "reasons"])
+
+def recommend_file(source: str, out: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                   top_k: int = DEFAULT_TOP_K, workers: int | None = None) -> dict:
+    # CSV with course, skills, interest (and optionally student_id) columns;
+    # chunks are scored in parallel and written in input order
+    start = time.perf_counter()
+    students = 0
+    header = True
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        chunks = pd.read_csv(source, chunksize=chunksize, dtype=str)
+        for result in pool.map(recommend_chunk, chunks, repeat(top_k)):
+            result.to_csv(out, mode="w" if header else "a", header=header, index=False)
+            header = False
+            students += result["student_id"].nunique()
+    seconds = time.perf_counter() - start
+    return {"students": students, "seconds": seconds, "students_per_second": students / seconds if seconds > 0 else 0.0}
+
+def main():
+    parser = argparse.ArgumentParser(description="Career recommendations for a whole cohort")
+    parser.add_argument("csv", help="CSV with course, skills, interest and optional student_id columns")
+    parser.add_argument("out", help="Output CSV (student_id, rank, title, confidence, reasons)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    stats = recommend_file(args.csv, args.out, args.chunksize, args.top_k, args.workers)
+    print(f"Recommended for {stats['students']:,} students in {stats['seconds']:.1f}s "
+          f"({stats['students_per_second']:,.0f} students/s)")
+
+if __name__ == "__main__":
+    main()
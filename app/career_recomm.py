@@ -1,80 +1,118 @@
+import json
+import re
+from collections import Counter
+
+TAXONOMY_PATH = "data/skill_taxonomy.json"
+
+# ── Skill taxonomy ───────────────────────────────────────────────────────────
+# Skill groups, aliases, course boosts and interest roles live in
+# data/skill_taxonomy.json and are compiled once at import into:
+#   keyword_groups  canonical keyword -> groups it counts towards
+#   aliases         every spelling (canonical or alias) -> canonical keyword
+#   matcher         one regex over all spellings, longest first, so free text
+#                   such as "worked with pandas & power bi" matches without
+#                   relying on comma splitting, and "excel advanced" is not
+#                   also counted as "excel"
+#   item_only       spellings that are also everyday words ("go", "content",
+#                   "excel"); they are left out of the matcher and count only
+#                   as a whole comma-separated item, so "I want to go into
+#                   finance" is not a Go skill
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+class SkillIndex:
+    def __init__(self, taxonomy: dict):
+        self.groups = list(taxonomy["groups"])
+        self.group_titles = {g: spec["title"] for g, spec in taxonomy["groups"].items()}
+        self.group_sizes = {g: len(spec["keywords"]) for g, spec in taxonomy["groups"].items()}
+        self.course_boost = taxonomy["course_boost"]
+        self.interest_map = taxonomy["interest_map"]
+
+        self.keyword_groups = {}
+        self.aliases = {}
+        for group, spec in taxonomy["groups"].items():
+            for keyword, alias_list in spec["keywords"].items():
+                keyword = _normalize(keyword)
+                self.keyword_groups.setdefault(keyword, []).append(group)
+                for spelling in [keyword] + [_normalize(a) for a in alias_list]:
+                    if self.aliases.setdefault(spelling, keyword) != keyword:
+                        raise ValueError(f"Skill spelling {spelling!r} maps to more than one keyword")
+
+        self.item_only = {_normalize(s) for s in taxonomy.get("item_only", [])}
+        unknown = self.item_only - set(self.aliases)
+        if unknown:
+            raise ValueError(f"item_only spellings not in the taxonomy: {sorted(unknown)}")
+
+        spellings = sorted(set(self.aliases) - self.item_only, key=len, reverse=True)
+        self.matcher = re.compile(
+            r"(?<![\w+#.])(" + "|".join(re.escape(s) for s in spellings) + r")(?![\w+#])"
+        )
+
+        # Titles that receive the course boost, precomputed for every known title
+        roles = taxonomy["course_boost_roles"]
+        titles = set(self.group_titles.values()) | {t for ts in self.interest_map.values() for t in ts}
+        self.boosted_titles = {t for t in titles if any(r in t.lower() for r in roles)}
+        self._roles = roles
+
+    def is_boosted(self, title: str) -> bool:
+        if title in self.boosted_titles:
+            return True
+        return any(r in title.lower() for r in self._roles)
+
+    def match_skills(self, skills_input: str) -> set:
+        # Canonical keywords mentioned anywhere in the input, plus item_only
+        # spellings given as a whole comma-separated item
+        matched = {self.aliases[m] for m in self.matcher.findall(_normalize(skills_input))}
+        for item in skills_input.split(","):
+            item = _normalize(item)
+            if item in self.item_only:
+                matched.add(self.aliases[item])
+        return matched
+
+    def group_matches(self, skills_input: str) -> Counter:
+        counts = Counter()
+        for keyword in self.match_skills(skills_input):
+            counts.update(self.keyword_groups[keyword])
+        return counts
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> SkillIndex:
+    with open(path, encoding="utf-8") as f:
+        return SkillIndex(json.load(f))
+
+skill_index = load_taxonomy()
+
 def recommend_career(course: str, skills_input: str, interest: str) -> list[dict]:
-    skills = [s.strip().lower() for s in skills_input.split(",") if s.strip()]
-
-    skill_groups = {
-        "programming": ["python", "java", "c++", "javascript", "c#", "go", "dsa"],
-        "web":         ["html", "css", "javascript", "react", "node", "django", "next.js"],
-        "data":        ["sql", "excel", "power bi", "tableau", "pandas", "statistics"],
-        "ai_ml":       ["machine learning", "ai", "ml", "deep learning", "tensorflow"],
-        "cloud":       ["aws", "azure", "gcp", "devops", "docker", "kubernetes"],
-        "marketing":   ["seo", "digital marketing", "content", "social media", "google ads"],
-        "design":      ["figma", "ui", "ux", "adobe", "graphic design"],
-        "finance":     ["finance", "accounting", "financial modeling", "excel advanced"],
-        "management":  ["project management", "agile", "business analysis", "leadership"]
-    }
-
-    course_boost = {
-        "BTech":  ["programming", "web", "ai_ml", "cloud", "data"],
-        "BCA":    ["programming", "web", "data", "ai_ml"],
-        "MCA":    ["programming", "ai_ml", "cloud", "data"],
-        "MBA":    ["management", "finance", "marketing"],
-        "BCom":   ["finance", "management", "marketing"],
-        "BSc":    ["data", "ai_ml", "programming"]
-    }
-
-    interest_map = {
-        "Technology":       ["Software Engineer", "Full-Stack Developer"],
-        "Data & Analytics": ["Data Analyst", "Data Scientist"],
-        "Management":       ["Business Analyst", "Product Manager"],
-        "Finance":          ["Financial Analyst"],
-        "Marketing":        ["Digital Marketer"],
-        "Design":           ["UI/UX Designer"],
-        "Research":         ["Research Analyst", "Data Scientist"]
-    }
+    index = skill_index
+    group_matches = index.group_matches(skills_input)
 
     recs = {}
 
     # Skill matches
-    for group, keywords in skill_groups.items():
-        matches = sum(1 for k in keywords if k in skills)
+    for group in index.groups:
+        matches = group_matches.get(group, 0)
         if matches > 0:
-            score = matches / len(keywords) * 60
-            if group == "programming":
-                title = "Software Engineer"
-            elif group == "web":
-                title = "Full-Stack / Web Developer"
-            elif group == "data":
-                title = "Data Analyst"
-            elif group == "ai_ml":
-                title = "AI / ML Engineer"
-            elif group == "cloud":
-                title = "Cloud / DevOps Engineer"
-            elif group == "marketing":
-                title = "Digital Marketer"
-            elif group == "design":
-                title = "UI/UX Designer"
-            elif group == "finance":
-                title = "Financial Analyst"
-            elif group == "management":
-                title = "Business Analyst"
-            else:
-                continue
+            score = matches / index.group_sizes[group] * 60
+            title = index.group_titles[group]
 
             recs[title] = recs.get(title, {"score": 0, "reasons": []})
             recs[title]["score"] += score
             recs[title]["reasons"].append(f"{group.replace('_', ' ').title()} skills ({matches} match)")
 
     # Interest boost
-    for role in interest_map.get(interest, []):
+    for role in index.interest_map.get(interest, []):
         recs[role] = recs.get(role, {"score": 0, "reasons": []})
         recs[role]["score"] += 70
         recs[role]["reasons"].append(f"Aligns with your interest: {interest}")
 
-    # Course boost
-    for group in course_boost.get(course, []):
-        for title, data in list(recs.items()):
-            if any(g in title.lower() for g in ["engineer", "developer", "analyst", "scientist"]):
-                data["score"] += 25
+    # Course boost: +25 per boosted group for every engineering/analyst role
+    boosts = len(index.course_boost.get(course, []))
+    if boosts:
+        for title, data in recs.items():
+            if index.is_boosted(title):
+                # Added one boost at a time to keep floating-point results identical
+                for _ in range(boosts):
+                    data["score"] += 25
                 data["reasons"].append(f"Strong fit for {course} graduates")
 
     # Format output
@@ -95,4 +133,4 @@ def recommend_career(course: str, skills_input: str, interest: str) -> list[dict
             "reasons": "Add more specific skills or consider certifications in Data Analytics, Cloud, AI, Digital Marketing"
         }]
 
-    return result[:6]
\ No newline at end of file
+    return result[:6]
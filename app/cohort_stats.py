@@ -0,0 +1,190 @@
+import argparse
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import database
+from database import (
+    HISTOGRAM_BINS, ensure_schema, get_generation, get_histograms, get_moments, histogram_bin,
+    replace_histograms, replace_moments,
+)
+from query_cache import cached
+
+# ── Cohort percentile sketches ───────────────────────────────────────────────
+# "Where do I stand" is answered from the fixed-bin histograms in the
+# feature_histograms table rather than by scanning rows: a sketch holds one
+# cumulative count array per (cohort, feature), so a percentile rank is two
+# array reads. The "training" source is built once from the cleaned dataset
+# (cohorts: all, placed, not_placed and each company tier); the "live" source
+# is maintained by a trigger on every saved prediction, split by predicted
+# outcome. The live sketch is loaded through the version-keyed read cache, so
+# a new prediction shows up in the live ranks on the next rerun; the training
+# sketch only changes when it is rebuilt, so it is kept per process and keyed
+# on the stored generation that replace_histograms() bumps. The training
+# build also stores per-feature moments, the baseline for drift.py.
+TRAINING_DATA_PATH = "data/processed/cleaned_placement_data.csv"
+
+# Model feature -> predictions column (the histogram feature names)
+FEATURE_COLUMNS = {
+    "CGPA": "cgpa",
+    "Internships": "internships",
+    "Projects": "projects",
+    "Workshops/Certifications": "workshops",
+    "AptitudeTestScore": "aptitude_score",
+    "SoftSkillsRating": "soft_skills",
+    "SSC_Marks": "ssc_marks",
+    "HSC_Marks": "hsc_marks",
+}
+
+# Yes/no flags: moments only, no histograms
+FLAG_COLUMNS = {
+    "ExtracurricularActivities": "extracurricular",
+    "PlacementTraining": "placement_training",
+}
+
+# Shown on the prediction tab, in this order
+STANDING_FEATURES = [
+    ("CGPA", "CGPA"),
+    ("AptitudeTestScore", "Aptitude Score"),
+    ("SoftSkillsRating", "Soft Skills"),
+    ("Internships", "Internships"),
+    ("Projects", "Projects"),
+    ("Workshops/Certifications", "Workshops"),
+]
+
+class CohortSketch:
+    def __init__(self, rows: List[tuple]):
+        # rows: (cohort, feature, bin, count) as stored in feature_histograms
+        counts: Dict[Tuple[str, str], np.ndarray] = {}
+        for cohort, feature, b, n in rows:
+            if feature not in HISTOGRAM_BINS:
+                continue
+            key = (cohort, feature)
+            if key not in counts:
+                counts[key] = np.zeros(HISTOGRAM_BINS[feature][2], dtype=np.int64)
+            counts[key][b] += n
+
+        # The live source is stored per outcome only; "all" is their sum
+        for feature in HISTOGRAM_BINS:
+            if ("all", feature) not in counts:
+                parts = [counts[(c, feature)] for c in ("placed", "not_placed") if (c, feature) in counts]
+                if parts:
+                    counts[("all", feature)] = np.sum(parts, axis=0)
+
+        # cumulative[k] = observations in bins below k
+        self._cumulative = {key: np.concatenate(([0], np.cumsum(c))) for key, c in counts.items()}
+
+    def total(self, cohort: str, feature: str) -> int:
+        cumulative = self._cumulative.get((cohort, feature))
+        return int(cumulative[-1]) if cumulative is not None else 0
+
+    def counts(self, cohort: str, feature: str) -> np.ndarray | None:
+        cumulative = self._cumulative.get((cohort, feature))
+        return np.diff(cumulative) if cumulative is not None else None
+
+    def percentile(self, cohort: str, feature: str, value: float) -> float | None:
+        # Mid-rank within the value's bin; None when the cohort has no data
+        cumulative = self._cumulative.get((cohort, feature))
+        if cumulative is None or not cumulative[-1]:
+            return None
+        b = histogram_bin(feature, value)
+        below, upto = cumulative[b], cumulative[b + 1]
+        return float((below + upto) / 2 / cumulative[-1] * 100)
+
+def _load_sketch(source: str) -> CohortSketch:
+    return CohortSketch(get_histograms(source))
+
+# ((DB_NAME, generation), sketch) for the training source
+_training_sketch: tuple | None = None
+
+def get_sketch(source: str) -> CohortSketch:
+    global _training_sketch
+    if source == "training":
+        key = (database.DB_NAME, get_generation())
+        if _training_sketch is None or _training_sketch[0] != key:
+            _training_sketch = (key, _load_sketch(source))
+        return _training_sketch[1]
+    return cached("cohort_sketch", _load_sketch, source)
+
+def training_histograms(df: pd.DataFrame) -> List[tuple]:
+    cohorts = {
+        "all": np.ones(len(df), dtype=bool),
+        "placed": (df["PlacementStatus"] == 1).to_numpy(),
+        "not_placed": (df["PlacementStatus"] == 0).to_numpy(),
+    }
+    for tier in sorted(df["Company_Tier"].dropna().unique()):
+        cohorts[str(tier)] = (df["Company_Tier"] == tier).to_numpy()
+
+    rows = []
+    for feature_name, column in FEATURE_COLUMNS.items():
+        low, width, n_bins = HISTOGRAM_BINS[column]
+        values = df[feature_name].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        # Same arithmetic as database.histogram_bin, vectorised
+        bins = np.clip(((np.where(present, values, low) - low) / width + 0.5).astype(np.int64), 0, n_bins - 1)
+        for cohort, mask in cohorts.items():
+            counts = np.bincount(bins[mask & present], minlength=n_bins)
+            rows.extend((cohort, column, int(b), int(counts[b])) for b in np.flatnonzero(counts))
+    return rows
+
+def training_moments(df: pd.DataFrame) -> List[tuple]:
+    rows = []
+    for feature_name, column in {**FEATURE_COLUMNS, **FLAG_COLUMNS}.items():
+        values = df[feature_name].dropna().to_numpy(dtype=np.float64)
+        rows.append((column, len(values), float(values.sum()), float(np.square(values).sum())))
+    return rows
+
+def build_training_histograms(path: str = TRAINING_DATA_PATH) -> int:
+    df = pd.read_csv(path)
+    rows = training_histograms(df)
+    replace_histograms("training", rows)
+    replace_moments("training", training_moments(df))
+    return len(rows)
+
+_training_checked = False
+_training_lock = threading.Lock()
+
+def ensure_training_histograms() -> None:
+    # Built on first use in a process if the table has no training rows yet
+    global _training_checked
+    if _training_checked:
+        return
+    with _training_lock:
+        if not _training_checked:
+            if not get_histograms("training") or not get_moments("training"):
+                build_training_histograms()
+            _training_checked = True
+
+def standing(profile: dict, tier: str | None = None) -> pd.DataFrame:
+    ensure_training_histograms()
+    training, live = get_sketch("training"), get_sketch("live")
+
+    records = []
+    for feature_name, label in STANDING_FEATURES:
+        column = FEATURE_COLUMNS[feature_name]
+        value = profile[feature_name]
+        record = {
+            "Feature": label,
+            "Your Value": value,
+            "vs All Students": training.percentile("all", column, value),
+            "vs Placed Students": training.percentile("placed", column, value),
+        }
+        if tier is not None:
+            record[f"vs {tier} Hires"] = training.percentile(tier, column, value)
+        record["vs App Users"] = live.percentile("all", column, value)
+        records.append(record)
+    return pd.DataFrame(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the training-cohort feature histograms")
+    parser.add_argument("--data", default=TRAINING_DATA_PATH, help="Cleaned dataset CSV")
+    args = parser.parse_args()
+
+    ensure_schema()
+    rows = build_training_histograms(args.data)
+    print(f"Stored {rows:,} non-empty training bins from {args.data}")
+
+if __name__ == "__main__":
+    main()
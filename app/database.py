@@ -1,19 +1,169 @@
+import argparse
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
-from typing import List, Dict, Any
+from functools import wraps
+from typing import List, Dict, Any, Iterable, Iterator
+
+from metrics import connection_factory, timed
 
 DB_NAME = "placement_system.db"
 
+# ── Connection management ────────────────────────────────────────────────────
+# Open connections are kept in a small pool shared by every thread (Streamlit
+# runs each rerun on a new thread), so connection setup, pragma negotiation
+# and schema parsing happen once per pooled connection instead of once per
+# query or per rerun. sqlite3 caches prepared statements per connection
+# (keyed by SQL text), which only pays off on reused connections. A thread
+# that asks again while it holds a connection gets the same one back.
+POOL_SIZE = 8               # idle connections kept; extra ones close on return
+BUSY_TIMEOUT_SECONDS = 5.0
+LOCK_RETRIES = 3
+LOCK_RETRY_BACKOFF_SECONDS = 0.05
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = {
+    "journal_mode": "WAL",      # readers no longer block the writer
+    "synchronous": "NORMAL",    # safe with WAL; fsync at checkpoints only
+    "cache_size": -16000,       # 16 MB page cache per connection
+    "mmap_size": 268435456,     # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+}
+
+# Durability of insert_prediction():
+#   "sync"          commit inside the caller's request (default)
+#   "write_behind"  queue the row and group-commit it from a background thread;
+#                   batches that hit a database error are retried, but rows
+#                   still queued if the process is killed are lost
+PREDICTION_WRITE_MODE = os.environ.get("PREDICTION_WRITE_MODE", "sync")
+WRITE_BEHIND_BATCH_SIZE = 500
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = 0.25
+
+# insert_prediction() results; None means the row was not saved
+PREDICTION_SAVED = "saved"
+PREDICTION_QUEUED = "queued"
+
+# Idle connections as (database file, connection)
+_pool: queue.Queue = queue.Queue(maxsize=POOL_SIZE)
+# The connection this thread has checked out, for nested get_connection() calls
+_local = threading.local()
+_writer = None
+# Bumped by every insert in this process; part of the global version in
+# get_data_version() so query caches notice new rows immediately, even
+# before a write-behind batch has landed
+_version_counter = 0
+_writer_lock = threading.Lock()
+# Database file whose schema this process has already initialised
+_schema_db = None
+_schema_lock = threading.Lock()
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_NAME,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        # Pooled connections move between threads, one thread at a time
+        check_same_thread=False,
+        # Times every statement and logs slow ones with their plan (metrics.py)
+        factory=connection_factory()
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
+def _checkout() -> tuple[str, sqlite3.Connection]:
+    while True:
+        try:
+            db_name, conn = _pool.get_nowait()
+        except queue.Empty:
+            return DB_NAME, _connect()
+        # Left over from a previous DB_NAME
+        if db_name == DB_NAME:
+            return db_name, conn
+        conn.close()
+
+def _checkin(db_name: str, conn: sqlite3.Connection) -> None:
+    # Uncommitted work is discarded on return, as it was when every call
+    # closed its own connection, so a pooled connection never holds locks
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        _pool.put_nowait((db_name, conn))
+    except (sqlite3.Error, queue.Full):
+        conn.close()
+
 @contextmanager
 def get_connection():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+
+    db_name, conn = _checkout()
+    _local.conn = conn
     try:
         yield conn
+    finally:
+        _local.conn = None
+        _checkin(db_name, conn)
+
+def close_connection() -> None:
+    # Drains the pool, closing every idle connection
+    while True:
+        try:
+            _, conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+
+def _is_lock_error(e: sqlite3.OperationalError) -> bool:
+    message = str(e).lower()
+    return "locked" in message or "busy" in message
+
+def retry_on_locked(fn):
+    # The busy timeout already waits for the lock; this retries the whole
+    # operation a few times when a burst of writers outlasts it
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                return fn(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if attempt == LOCK_RETRIES or not _is_lock_error(e):
+                    raise
+                time.sleep(LOCK_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+    return wrapper
+
+def ensure_schema() -> None:
+    # init_db() once per process (and per DB_NAME); cheap on every Streamlit rerun
+    global _schema_db
+    if _schema_db == DB_NAME:
+        return
+    with _schema_lock:
+        if _schema_db != DB_NAME:
+            init_db()
+            _schema_db = DB_NAME
+
+def _create_file() -> None:
+    # auto_vacuum needs the write lock and only takes on a file that has no
+    # pages yet, so it is set once here, before WAL writes the header, rather
+    # than on every connection. It lets retention.py return freed pages;
+    # older files switch with one VACUUM (retention.py --full-vacuum).
+    conn = sqlite3.connect(DB_NAME, timeout=BUSY_TIMEOUT_SECONDS)
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
     finally:
         conn.close()
 
 def init_db() -> None:
+    if not os.path.exists(DB_NAME) or os.path.getsize(DB_NAME) == 0:
+        _create_file()
     with get_connection() as conn:
         cursor = conn.cursor()
 
@@ -43,14 +193,677 @@ def init_db() -> None:
                 hsc_marks           REAL,
                 placement_status    INTEGER NOT NULL CHECK(placement_status IN (0, 1)),
                 predicted_at        DATETIME DEFAULT CURRENT_TIMESTAMP,
+                repeat_count        INTEGER NOT NULL DEFAULT 1,
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
             )
         """)
 
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_user_id ON predictions(user_id)")
+        # Rows per submission: retention.py collapses consecutive identical
+        # submissions into one row. Older files gain the column here
+        cursor.execute("PRAGMA table_info(predictions)")
+        if "repeat_count" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE predictions ADD COLUMN repeat_count INTEGER NOT NULL DEFAULT 1")
+
+        # (user_id, predicted_at) serves per-student history in date order and
+        # supersedes the old single-column user_id index
+        cursor.execute("DROP INDEX IF EXISTS idx_predictions_user_id")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_user_date ON predictions(user_id, predicted_at, id)")
+        # Keyset pagination for the admin browser walks (predicted_at, id)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_date_id ON predictions(predicted_at, id)")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS cohort_predictions (
+                id                      INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch_id                TEXT NOT NULL,
+                student_id              TEXT,
+                cgpa                    REAL NOT NULL,
+                internships             INTEGER NOT NULL DEFAULT 0,
+                projects                INTEGER NOT NULL DEFAULT 0,
+                workshops               INTEGER NOT NULL DEFAULT 0,
+                aptitude_score          INTEGER NOT NULL,
+                soft_skills             REAL NOT NULL,
+                extracurricular         INTEGER NOT NULL CHECK(extracurricular IN (0, 1)),
+                placement_training      INTEGER NOT NULL CHECK(placement_training IN (0, 1)),
+                ssc_marks               REAL,
+                hsc_marks               REAL,
+                placement_status        INTEGER NOT NULL CHECK(placement_status IN (0, 1)),
+                placement_probability   REAL,
+                company_tier            TEXT,
+                scored_at               DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cohort_predictions_batch_id ON cohort_predictions(batch_id)")
+
+        # Bumped by maintenance that rewrites or removes rows (retention,
+        # rebuilds), so caches in every process see it
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+                id          INTEGER PRIMARY KEY CHECK(id = 1),
+                generation  INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO data_version (id, generation) VALUES (1, 0)")
+
+        _create_rollups(cursor)
+        _create_feature_histograms(cursor)
+        _create_feature_moments(cursor)
 
         conn.commit()
 
+# ── Rollups ──────────────────────────────────────────────────────────────────
+# Admin metrics are read from summary tables kept current by an AFTER INSERT
+# trigger on predictions, so they cost O(1) regardless of table size and also
+# cover rows written by executemany (write-behind, bulk loads).
+ROLLUP_FEATURES = [
+    "cgpa", "internships", "projects", "workshops", "aptitude_score", "soft_skills",
+    "extracurricular", "placement_training", "ssc_marks", "hsc_marks"
+]
+NULLABLE_FEATURES = ["ssc_marks", "hsc_marks"]
+
+def _create_rollups(cursor: sqlite3.Cursor) -> None:
+    sum_columns = ",\n".join(f"sum_{f} REAL NOT NULL DEFAULT 0" for f in ROLLUP_FEATURES)
+    count_columns = ",\n".join(f"count_{f} INTEGER NOT NULL DEFAULT 0" for f in NULLABLE_FEATURES)
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS prediction_rollup (
+            id          INTEGER PRIMARY KEY CHECK(id = 1),
+            total       INTEGER NOT NULL DEFAULT 0,
+            placed      INTEGER NOT NULL DEFAULT 0,
+            students    INTEGER NOT NULL DEFAULT 0,
+            {sum_columns},
+            {count_columns}
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS prediction_daily_rollup (
+            day     TEXT PRIMARY KEY,
+            total   INTEGER NOT NULL DEFAULT 0,
+            placed  INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS prediction_student_rollup (
+            user_id             INTEGER PRIMARY KEY,
+            total               INTEGER NOT NULL DEFAULT 0,
+            placed              INTEGER NOT NULL DEFAULT 0,
+            last_predicted_at   DATETIME
+        )
+    """)
+
+    sum_updates = ",\n".join(
+        f"sum_{f} = sum_{f} + COALESCE(NEW.{f}, 0)" if f in NULLABLE_FEATURES else f"sum_{f} = sum_{f} + NEW.{f}"
+        for f in ROLLUP_FEATURES
+    )
+    count_updates = ",\n".join(f"count_{f} = count_{f} + (NEW.{f} IS NOT NULL)" for f in NULLABLE_FEATURES)
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_rollup
+        AFTER INSERT ON predictions
+        BEGIN
+            UPDATE prediction_rollup SET
+                total = total + 1,
+                placed = placed + NEW.placement_status,
+                students = students + NOT EXISTS (
+                    SELECT 1 FROM prediction_student_rollup WHERE user_id = NEW.user_id
+                ),
+                {sum_updates},
+                {count_updates}
+            WHERE id = 1;
+
+            INSERT INTO prediction_daily_rollup (day, total, placed)
+            VALUES (DATE(NEW.predicted_at), 1, NEW.placement_status)
+            ON CONFLICT(day) DO UPDATE SET
+                total = total + 1,
+                placed = placed + excluded.placed;
+
+            INSERT INTO prediction_student_rollup (user_id, total, placed, last_predicted_at)
+            VALUES (NEW.user_id, 1, NEW.placement_status, NEW.predicted_at)
+            ON CONFLICT(user_id) DO UPDATE SET
+                total = total + 1,
+                placed = placed + excluded.placed,
+                last_predicted_at = MAX(last_predicted_at, excluded.last_predicted_at);
+        END
+    """)
+
+    # First run against a database that predates the rollups
+    cursor.execute("SELECT 1 FROM prediction_rollup WHERE id = 1")
+    if cursor.fetchone() is None:
+        _rebuild_rollups(cursor)
+
+# Rollups, histograms and moments count every submission ever made. Rows
+# collapsed or archived by retention.py stay counted (the triggers only fire
+# on insert), so rebuilds weight each row by repeat_count and include the
+# archive tables when the archive database is attached. Archive rows whose id
+# is still in the hot table (an archive run stopped between its two commits)
+# are skipped, so no row is counted twice.
+def _archive_tables(cursor: sqlite3.Cursor) -> List[str]:
+    # Monthly archive tables, oldest first; empty unless the archive is attached
+    cursor.execute("SELECT name FROM pragma_database_list WHERE name = 'archive'")
+    if cursor.fetchone() is None:
+        return []
+    cursor.execute("SELECT name FROM archive.sqlite_master WHERE type = 'table' AND name LIKE 'predictions_%' ORDER BY name")
+    return [row[0] for row in cursor.fetchall()]
+
+def _prediction_source(cursor: sqlite3.Cursor) -> str:
+    tables = _archive_tables(cursor)
+    if not tables:
+        return "predictions"
+    columns = ", ".join(PREDICTION_TABLE_COLUMNS)
+    selects = [f"SELECT {columns} FROM main.predictions"] + [
+        f"SELECT {columns} FROM archive.{t} a WHERE NOT EXISTS (SELECT 1 FROM main.predictions m WHERE m.id = a.id)"
+        for t in tables
+    ]
+    return "(" + " UNION ALL ".join(selects) + ")"
+
+def _rebuild_rollups(cursor: sqlite3.Cursor) -> None:
+    source = _prediction_source(cursor)
+    cursor.execute("DELETE FROM prediction_rollup")
+    cursor.execute("DELETE FROM prediction_daily_rollup")
+    cursor.execute("DELETE FROM prediction_student_rollup")
+
+    columns = ", ".join(
+        ["id", "total", "placed", "students"]
+        + [f"sum_{f}" for f in ROLLUP_FEATURES]
+        + [f"count_{f}" for f in NULLABLE_FEATURES]
+    )
+    aggregates = ", ".join(
+        ["1", "COALESCE(SUM(repeat_count), 0)", "COALESCE(SUM(placement_status * repeat_count), 0)",
+         "COUNT(DISTINCT user_id)"]
+        + [f"TOTAL({f} * repeat_count)" for f in ROLLUP_FEATURES]
+        + [f"TOTAL(({f} IS NOT NULL) * repeat_count)" for f in NULLABLE_FEATURES]
+    )
+    cursor.execute(f"INSERT INTO prediction_rollup ({columns}) SELECT {aggregates} FROM {source}")
+
+    # A collapsed run keeps its latest timestamp, so it counts on that day
+    cursor.execute(f"""
+        INSERT INTO prediction_daily_rollup (day, total, placed)
+        SELECT DATE(predicted_at), SUM(repeat_count), SUM(placement_status * repeat_count)
+        FROM {source}
+        GROUP BY DATE(predicted_at)
+    """)
+
+    cursor.execute(f"""
+        INSERT INTO prediction_student_rollup (user_id, total, placed, last_predicted_at)
+        SELECT user_id, SUM(repeat_count), SUM(placement_status * repeat_count), MAX(predicted_at)
+        FROM {source}
+        GROUP BY user_id
+    """)
+
+# ── Feature histograms ───────────────────────────────────────────────────────
+# Fixed-bin counts per (source, cohort, feature) back the percentile ranks on
+# the prediction tab (see cohort_stats.py). The "live" source is kept current
+# by a trigger on predictions, split by predicted outcome; the "training"
+# source is written by cohort_stats.build_training_histograms(). A second
+# trigger keeps the same counts per calendar month (UTC) under sources
+# "live:YYYY-MM", so drift.py can look at recent submissions only. The table
+# is bounded by the bin layout below per month, however many predictions
+# accumulate.
+#   column -> (low, bin width, number of bins); values are clamped into range
+HISTOGRAM_BINS = {
+    "cgpa":           (0.0, 0.05, 201),
+    "internships":    (0.0, 1.0, 11),
+    "projects":       (0.0, 1.0, 16),
+    "workshops":      (0.0, 1.0, 21),
+    "aptitude_score": (0.0, 1.0, 101),
+    "soft_skills":    (0.0, 0.1, 51),
+    "ssc_marks":      (0.0, 0.5, 201),
+    "hsc_marks":      (0.0, 0.5, 201),
+}
+
+LIVE_MONTH_PREFIX = "live:"
+
+def live_month_source(month: str) -> str:
+    # month: 'YYYY-MM'
+    return f"{LIVE_MONTH_PREFIX}{month}"
+
+# Month source of a new row; predicted_at is only NULL if set so explicitly,
+# and such rows count towards the current month
+_NEW_MONTH_SOURCE_SQL = f"'{LIVE_MONTH_PREFIX}' || strftime('%Y-%m', COALESCE(NEW.predicted_at, 'now'))"
+
+def _has_trigger(cursor: sqlite3.Cursor, name: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+def histogram_bin(column: str, value: float) -> int:
+    # Same arithmetic as _bin_sql(), so Python lookups land in the trigger's bins
+    low, width, n_bins = HISTOGRAM_BINS[column]
+    return min(max(int((value - low) / width + 0.5), 0), n_bins - 1)
+
+def _bin_sql(column: str, value: str) -> str:
+    low, width, n_bins = HISTOGRAM_BINS[column]
+    return f"MIN(MAX(CAST(({value} - {low}) / {width} + 0.5 AS INTEGER), 0), {n_bins - 1})"
+
+def _create_feature_histograms(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feature_histograms'")
+    is_new = cursor.fetchone() is None
+    months_new = not _has_trigger(cursor, "trg_predictions_histograms_monthly")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feature_histograms (
+            source  TEXT NOT NULL,
+            cohort  TEXT NOT NULL,
+            feature TEXT NOT NULL,
+            bin     INTEGER NOT NULL,
+            count   INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, cohort, feature, bin)
+        ) WITHOUT ROWID
+    """)
+
+    bins = "\nUNION ALL ".join(
+        f"SELECT '{c}' AS feature, {_bin_sql(c, f'NEW.{c}')} AS bin WHERE NEW.{c} IS NOT NULL"
+        for c in HISTOGRAM_BINS
+    )
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_histograms
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO feature_histograms (source, cohort, feature, bin, count)
+            SELECT 'live', CASE NEW.placement_status WHEN 1 THEN 'placed' ELSE 'not_placed' END, feature, bin, 1
+            FROM ({bins})
+            WHERE true
+            ON CONFLICT(source, cohort, feature, bin) DO UPDATE SET count = count + 1;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_histograms_monthly
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO feature_histograms (source, cohort, feature, bin, count)
+            SELECT {_NEW_MONTH_SOURCE_SQL}, CASE NEW.placement_status WHEN 1 THEN 'placed' ELSE 'not_placed' END,
+                   feature, bin, 1
+            FROM ({bins})
+            WHERE true
+            ON CONFLICT(source, cohort, feature, bin) DO UPDATE SET count = count + 1;
+        END
+    """)
+
+    # First run against a database that predates the histograms; one that
+    # predates the monthly trigger gets its months filled in from the hot
+    # table (archived months are older than any drift window)
+    if is_new or months_new:
+        _rebuild_feature_histograms(cursor, months_only=not is_new)
+
+def _rebuild_feature_histograms(cursor: sqlite3.Cursor, months_only: bool = False) -> None:
+    source = _prediction_source(cursor)
+    cursor.execute("DELETE FROM feature_histograms WHERE source LIKE 'live:%'")
+    if not months_only:
+        cursor.execute("DELETE FROM feature_histograms WHERE source = 'live'")
+    for c in HISTOGRAM_BINS:
+        if not months_only:
+            cursor.execute(f"""
+                INSERT INTO feature_histograms (source, cohort, feature, bin, count)
+                SELECT 'live', CASE placement_status WHEN 1 THEN 'placed' ELSE 'not_placed' END,
+                       '{c}', {_bin_sql(c, c)} AS b, SUM(repeat_count)
+                FROM {source}
+                WHERE {c} IS NOT NULL
+                GROUP BY placement_status, b
+            """)
+        cursor.execute(f"""
+            INSERT INTO feature_histograms (source, cohort, feature, bin, count)
+            SELECT '{LIVE_MONTH_PREFIX}' || strftime('%Y-%m', COALESCE(predicted_at, 'now')) AS month,
+                   CASE placement_status WHEN 1 THEN 'placed' ELSE 'not_placed' END,
+                   '{c}', {_bin_sql(c, c)} AS b, SUM(repeat_count)
+            FROM {source}
+            WHERE {c} IS NOT NULL
+            GROUP BY month, placement_status, b
+        """)
+
+# Count, sum and sum of squares per (source, feature): means and standard
+# deviations for the drift monitor (drift.py), including the two yes/no
+# flags, whose mean is the share answering yes. Live rows are trigger-kept,
+# in total and per month like the histograms.
+MOMENT_COLUMNS = list(HISTOGRAM_BINS) + ["extracurricular", "placement_training"]
+
+def _create_feature_moments(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feature_moments'")
+    is_new = cursor.fetchone() is None
+    months_new = not _has_trigger(cursor, "trg_predictions_moments_monthly")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feature_moments (
+            source   TEXT NOT NULL,
+            feature  TEXT NOT NULL,
+            count    INTEGER NOT NULL DEFAULT 0,
+            total    REAL NOT NULL DEFAULT 0,
+            total_sq REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, feature)
+        ) WITHOUT ROWID
+    """)
+
+    values = "\nUNION ALL ".join(
+        f"SELECT '{c}' AS feature, NEW.{c} AS value WHERE NEW.{c} IS NOT NULL" for c in MOMENT_COLUMNS
+    )
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_moments
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO feature_moments (source, feature, count, total, total_sq)
+            SELECT 'live', feature, 1, value, value * value
+            FROM ({values})
+            WHERE true
+            ON CONFLICT(source, feature) DO UPDATE SET
+                count    = count + 1,
+                total    = total + excluded.total,
+                total_sq = total_sq + excluded.total_sq;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_moments_monthly
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO feature_moments (source, feature, count, total, total_sq)
+            SELECT {_NEW_MONTH_SOURCE_SQL}, feature, 1, value, value * value
+            FROM ({values})
+            WHERE true
+            ON CONFLICT(source, feature) DO UPDATE SET
+                count    = count + 1,
+                total    = total + excluded.total,
+                total_sq = total_sq + excluded.total_sq;
+        END
+    """)
+
+    if is_new or months_new:
+        _rebuild_feature_moments(cursor, months_only=not is_new)
+
+def _rebuild_feature_moments(cursor: sqlite3.Cursor, months_only: bool = False) -> None:
+    source = _prediction_source(cursor)
+    cursor.execute("DELETE FROM feature_moments WHERE source LIKE 'live:%'")
+    if not months_only:
+        cursor.execute("DELETE FROM feature_moments WHERE source = 'live'")
+    for c in MOMENT_COLUMNS:
+        if not months_only:
+            cursor.execute(f"""
+                INSERT INTO feature_moments (source, feature, count, total, total_sq)
+                SELECT 'live', '{c}', SUM(repeat_count), TOTAL({c} * repeat_count), TOTAL({c} * {c} * repeat_count)
+                FROM {source}
+                WHERE {c} IS NOT NULL
+                HAVING COUNT(*) > 0
+            """)
+        cursor.execute(f"""
+            INSERT INTO feature_moments (source, feature, count, total, total_sq)
+            SELECT '{LIVE_MONTH_PREFIX}' || strftime('%Y-%m', COALESCE(predicted_at, 'now')) AS month, '{c}',
+                   SUM(repeat_count), TOTAL({c} * repeat_count), TOTAL({c} * {c} * repeat_count)
+            FROM {source}
+            WHERE {c} IS NOT NULL
+            GROUP BY month
+        """)
+
+def replace_moments(source: str, rows: List[tuple]) -> None:
+    # rows: (feature, count, total, total_sq); replaces everything stored for source
+    with get_connection() as conn:
+        conn.execute("DELETE FROM feature_moments WHERE source = ?", (source,))
+        conn.executemany(
+            "INSERT INTO feature_moments (source, feature, count, total, total_sq) VALUES (?, ?, ?, ?, ?)",
+            [(source, *row) for row in rows]
+        )
+        conn.commit()
+    # cohort_stats.py may run as a separate command
+    bump_data_version(persist=True)
+
+@timed("db.get_moments")
+def get_moments(source: str) -> Dict[str, tuple]:
+    # feature -> (count, total, total_sq)
+    with get_connection() as conn:
+        cursor = conn.execute(
+            "SELECT feature, count, total, total_sq FROM feature_moments WHERE source = ?", (source,)
+        )
+        return {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+# Month sources sort by date, and ';' sorts straight after ':'
+_LIVE_MONTHS_UNTIL = LIVE_MONTH_PREFIX[:-1] + ";"
+
+@timed("db.get_recent_moments")
+def get_recent_moments(since_month: str) -> Dict[str, tuple]:
+    # Live moments summed over the months from since_month ('YYYY-MM') on
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT feature, SUM(count), SUM(total), SUM(total_sq) FROM feature_moments
+            WHERE source >= ? AND source < ?
+            GROUP BY feature
+        """, (live_month_source(since_month), _LIVE_MONTHS_UNTIL))
+        return {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+def replace_histograms(source: str, rows: List[tuple]) -> None:
+    # rows: (cohort, feature, bin, count); replaces everything stored for source
+    with get_connection() as conn:
+        conn.execute("DELETE FROM feature_histograms WHERE source = ?", (source,))
+        conn.executemany(
+            "INSERT INTO feature_histograms (source, cohort, feature, bin, count) VALUES (?, ?, ?, ?, ?)",
+            [(source, *row) for row in rows]
+        )
+        conn.commit()
+    bump_data_version(persist=True)
+
+@timed("db.get_histograms")
+def get_histograms(source: str) -> List[tuple]:
+    with get_connection() as conn:
+        cursor = conn.execute(
+            "SELECT cohort, feature, bin, count FROM feature_histograms WHERE source = ?", (source,)
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+@timed("db.get_recent_histograms")
+def get_recent_histograms(since_month: str) -> List[tuple]:
+    # Live bins summed over the months from since_month ('YYYY-MM') on
+    with get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT cohort, feature, bin, SUM(count) FROM feature_histograms
+            WHERE source >= ? AND source < ?
+            GROUP BY cohort, feature, bin
+        """, (live_month_source(since_month), _LIVE_MONTHS_UNTIL))
+        return [tuple(row) for row in cursor.fetchall()]
+
+# ── Archive ──────────────────────────────────────────────────────────────────
+# Predictions older than the retention window are moved by retention.py into
+# monthly tables (predictions_YYYY_MM) in a separate database file next to
+# DB_NAME, attached as "archive" only while it is needed.
+PREDICTION_TABLE_COLUMNS = [
+    "id", "user_id", "cgpa", "internships", "projects", "workshops", "aptitude_score",
+    "soft_skills", "extracurricular", "placement_training", "ssc_marks", "hsc_marks",
+    "placement_status", "predicted_at", "repeat_count"
+]
+
+def archive_path() -> str:
+    base, ext = os.path.splitext(DB_NAME)
+    return f"{base}_archive{ext or '.db'}"
+
+@contextmanager
+def attached_archive(conn: sqlite3.Connection, create: bool = False):
+    # Yields whether the archive is attached; without create, a missing file
+    # is left alone rather than created empty
+    path = archive_path()
+    if not create and not os.path.exists(path):
+        yield False
+        return
+    conn.execute("ATTACH DATABASE ? AS archive", (path,))
+    try:
+        yield True
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("DETACH DATABASE archive")
+
+@contextmanager
+def prediction_tables(conn: sqlite3.Connection, include_archive: bool = False):
+    # Yields the tables to read predictions from: the hot table, plus with
+    # include_archive every archived month
+    if not include_archive:
+        yield ["main.predictions"]
+        return
+    with attached_archive(conn):
+        yield ["main.predictions"] + [f"archive.{t}" for t in _archive_tables(conn.cursor())]
+
+def union_select(tables: List[str], select: str) -> str:
+    # select reads "FROM {table} p ... WHERE ..."; one copy per table, joined
+    # with UNION ALL, so the caller's ORDER BY and LIMIT apply to the whole.
+    # Each branch keeps its own WHERE and indexes (archive tables are indexed
+    # like the hot table, see retention.py), and SQLite merges branches that
+    # come out in ORDER BY order, stopping once LIMIT rows are out. Archive
+    # rows still in the hot table are skipped, as in _prediction_source().
+    branches = []
+    for table in tables:
+        branch = select.format(table=table)
+        if table != "main.predictions":
+            branch += " AND NOT EXISTS (SELECT 1 FROM main.predictions m WHERE m.id = p.id)"
+        branches.append(branch)
+    return "\nUNION ALL\n".join(branches)
+
+def rebuild_rollups() -> bool:
+    # Recompute every rollup from the predictions table (and the archive, if
+    # there is one) in one transaction
+    try:
+        with get_connection() as conn, attached_archive(conn):
+            _rebuild_rollups(conn.cursor())
+            _rebuild_feature_histograms(conn.cursor())
+            _rebuild_feature_moments(conn.cursor())
+            conn.commit()
+        bump_data_version(persist=True)
+        return True
+    except Exception as e:
+        print(f"Rollup rebuild error: {e}")
+        return False
+
+@timed("db.get_prediction_summary")
+def get_prediction_summary() -> Dict[str, Any]:
+    try:
+        with get_connection() as conn:
+            row = conn.execute("SELECT * FROM prediction_rollup WHERE id = 1").fetchone()
+    except Exception as e:
+        print(f"Fetch summary error: {e}")
+        row = None
+
+    if row is None or row["total"] == 0:
+        return {"total": 0, "placed": 0, "placement_rate": 0.0, "students": 0, "means": {}}
+
+    total = row["total"]
+    means = {
+        f: row[f"sum_{f}"] / (row[f"count_{f}"] if f in NULLABLE_FEATURES else total)
+        for f in ROLLUP_FEATURES
+        if f not in NULLABLE_FEATURES or row[f"count_{f}"] > 0
+    }
+    return {
+        "total": total,
+        "placed": row["placed"],
+        "placement_rate": row["placed"] / total,
+        "students": row["students"],
+        "means": means,
+    }
+
+@timed("db.get_daily_summary")
+def get_daily_summary(days: int = 90) -> List[Dict[str, Any]]:
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT day, total, placed
+                FROM prediction_daily_rollup
+                ORDER BY day DESC
+                LIMIT ?
+            """, (days,))
+            return [dict(row) for row in cursor.fetchall()][::-1]
+    except Exception as e:
+        print(f"Fetch daily summary error: {e}")
+        return []
+
+INSERT_PREDICTION_SQL = """
+    INSERT INTO predictions (
+        user_id, cgpa, internships, projects, workshops, aptitude_score,
+        soft_skills, extracurricular, placement_training, ssc_marks, hsc_marks, placement_status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+@retry_on_locked
+def _execute_write(sql: str, params: tuple = ()) -> None:
+    with get_connection() as conn:
+        conn.execute(sql, params)
+        conn.commit()
+
+@timed("db.insert_predictions")
+@retry_on_locked
+def insert_predictions(rows: List[tuple]) -> int:
+    # Group commit: every row in one transaction
+    with get_connection() as conn:
+        cursor = conn.executemany(INSERT_PREDICTION_SQL, rows)
+        conn.commit()
+    bump_data_version()
+    return cursor.rowcount
+
+def bump_data_version(persist: bool = False) -> None:
+    # persist: also bump the stored generation, for changes other processes'
+    # caches must see even though no new row was inserted
+    global _version_counter
+    _version_counter += 1
+    if persist:
+        _execute_write("UPDATE data_version SET generation = generation + 1 WHERE id = 1")
+
+def get_generation() -> int | None:
+    # The stored generation alone: changes on maintenance and training
+    # rebuilds, not on new predictions
+    try:
+        with get_connection() as conn:
+            row = conn.execute("SELECT generation FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"Fetch generation error: {e}")
+        return None
+
+def get_data_version(user_id: int | None = None) -> tuple:
+    # Cheap change marker for cache keys. Globally: MAX(id), a rowid lookup,
+    # plus this process's insert counter. Per student: MAX(id) and COUNT(*)
+    # over a short index range, so other students' inserts leave the key
+    # alone while compaction and archiving (fewer rows) still change it.
+    # Both include the stored generation.
+    try:
+        with get_connection() as conn:
+            if user_id is None:
+                row = conn.execute("""
+                    SELECT (SELECT MAX(id) FROM predictions),
+                           (SELECT generation FROM data_version WHERE id = 1)
+                """).fetchone()
+                return (row[0], row[1], _version_counter)
+            row = conn.execute("""
+                SELECT MAX(id), COUNT(*), (SELECT generation FROM data_version WHERE id = 1)
+                FROM predictions WHERE user_id = ?
+            """, (user_id,)).fetchone()
+            return tuple(row)
+    except Exception as e:
+        print(f"Fetch data version error: {e}")
+        return (None, None, _version_counter)
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from prediction_writer import PredictionWriter
+                writer = PredictionWriter(
+                    insert_predictions,
+                    batch_size=WRITE_BEHIND_BATCH_SIZE,
+                    flush_interval=WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+                    # Locked, busy, full or I/O errors; constraint errors are final
+                    retry_on=lambda e: isinstance(e, sqlite3.OperationalError)
+                )
+                writer.start()
+                atexit.register(writer.stop)
+                _writer = writer
+    return _writer
+
+def flush_pending_predictions() -> None:
+    # Drains the write-behind queue (no-op in sync mode)
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop()
+
+def get_write_behind_stats() -> Dict[str, Any]:
+    if _writer is None:
+        return {"mode": PREDICTION_WRITE_MODE, "queue_depth": 0}
+    return {"mode": PREDICTION_WRITE_MODE, **_writer.stats()}
+
+@timed("db.insert_prediction")
 def insert_prediction(
     user_id: int,
     cgpa: float,
@@ -64,44 +877,92 @@ def insert_prediction(
     ssc: float | None = None,
     hsc: float | None = None,
     status: int = 0
-) -> bool:
+) -> str | None:
+    row = (
+        user_id, cgpa, internships, projects, workshops, aptitude,
+        soft_skills, extracurricular, placement_training, ssc, hsc, status
+    )
     try:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO predictions (
-                    user_id, cgpa, internships, projects, workshops, aptitude_score,
-                    soft_skills, extracurricular, placement_training, ssc_marks, hsc_marks, placement_status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                user_id, cgpa, internships, projects, workshops, aptitude,
-                soft_skills, extracurricular, placement_training, ssc, hsc, status
-            ))
-            conn.commit()
-        return True
+        # A full queue falls back to a synchronous write rather than dropping
+        if PREDICTION_WRITE_MODE == "write_behind" and _get_writer().submit(row):
+            result = PREDICTION_QUEUED
+        else:
+            _execute_write(INSERT_PREDICTION_SQL, row)
+            result = PREDICTION_SAVED
+        bump_data_version()
+        return result
     except Exception as e:
         print(f"Insert error: {e}")
-        return False
+        return None
+
+@timed("db.insert_users")
+@retry_on_locked
+def insert_users(rows: List[tuple]) -> int:
+    # rows: (username, password_hash, role). One transaction; usernames that
+    # already exist are skipped rather than aborting the batch.
+    with get_connection() as conn:
+        cursor = conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)", rows
+        )
+        conn.commit()
+        return cursor.rowcount
+
+@timed("db.get_existing_usernames")
+def get_existing_usernames(usernames: List[str], chunk_size: int = 500) -> set:
+    existing = set()
+    with get_connection() as conn:
+        for i in range(0, len(usernames), chunk_size):
+            chunk = usernames[i:i + chunk_size]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = conn.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+@timed("db.insert_cohort_predictions")
+def insert_cohort_predictions(rows: Iterable[tuple]) -> int:
+    # rows: (batch_id, student_id, cgpa, internships, projects, workshops, aptitude,
+    #        soft_skills, extracurricular, placement_training, ssc, hsc,
+    #        status, probability, tier)
+    # All rows are written with executemany inside a single transaction, so a
+    # generator can stream a whole roster without materialising it. Errors,
+    # including those raised by the generator, roll it back and propagate.
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO cohort_predictions (
+                batch_id, student_id, cgpa, internships, projects, workshops, aptitude_score,
+                soft_skills, extracurricular, placement_training, ssc_marks, hsc_marks,
+                placement_status, placement_probability, company_tier
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        inserted = cursor.rowcount
+        conn.commit()
+    return inserted
 
-def get_user_predictions(user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+@timed("db.get_user_predictions")
+def get_user_predictions(user_id: int, limit: int = 50, include_archive: bool = False) -> List[Dict[str, Any]]:
     try:
-        with get_connection() as conn:
+        with get_connection() as conn, prediction_tables(conn, include_archive) as tables:
             cursor = conn.cursor()
-            cursor.execute("""
+            select = union_select(tables, """
                 SELECT 
-                    cgpa, internships, projects, workshops, aptitude_score, soft_skills,
-                    extracurricular, placement_training, ssc_marks, hsc_marks,
-                    placement_status, predicted_at
-                FROM predictions
-                WHERE user_id = ?
-                ORDER BY predicted_at DESC
+                    p.id, p.cgpa, p.internships, p.projects, p.workshops, p.aptitude_score, p.soft_skills,
+                    p.extracurricular, p.placement_training, p.ssc_marks, p.hsc_marks,
+                    p.placement_status, p.predicted_at, p.repeat_count
+                FROM {table} p
+                WHERE p.user_id = ?
+            """)
+            cursor.execute(f"""
+                {select}
+                ORDER BY predicted_at DESC, id DESC
                 LIMIT ?
-            """, (user_id, limit))
+            """, (user_id,) * len(tables) + (limit,))
             return [dict(row) for row in cursor.fetchall()]
     except Exception as e:
         print(f"Fetch user predictions error: {e}")
         return []
 
+@timed("db.get_all_predictions")
 def get_all_predictions(limit: int = 500) -> List[Dict[str, Any]]:
     try:
         with get_connection() as conn:
@@ -113,10 +974,136 @@ def get_all_predictions(limit: int = 500) -> List[Dict[str, Any]]:
                     p.ssc_marks, p.hsc_marks, p.placement_status, p.predicted_at
                 FROM predictions p
                 JOIN users u ON p.user_id = u.id
-                ORDER BY p.predicted_at DESC
+                ORDER BY p.predicted_at DESC, p.id DESC
                 LIMIT ?
             """, (limit,))
             return [dict(row) for row in cursor.fetchall()]
     except Exception as e:
         print(f"Fetch all predictions error: {e}")
-        return []
\ No newline at end of file
+        return []
+
+# ── Filtered, keyset-paginated browsing ──────────────────────────────────────
+# Supported filter keys (all optional):
+#   student                   exact username
+#   date_from, date_to        'YYYY-MM-DD', inclusive
+#   cgpa_min, cgpa_max        inclusive
+#   aptitude_min, aptitude_max
+#   placed                    1 or 0
+# Named so ORDER BY id means the prediction id, with users joined
+PREDICTION_COLUMNS = """
+    p.id AS id, u.username, p.cgpa, p.internships, p.projects, p.workshops,
+    p.aptitude_score, p.soft_skills, p.extracurricular, p.placement_training,
+    p.ssc_marks, p.hsc_marks, p.placement_status, p.predicted_at
+"""
+
+def build_prediction_filter(filters: Dict[str, Any] | None) -> tuple[str, list]:
+    filters = filters or {}
+    clauses = []
+    params = []
+
+    if filters.get("student"):
+        clauses.append("u.username = ?")
+        params.append(filters["student"])
+    if filters.get("date_from"):
+        clauses.append("p.predicted_at >= ?")
+        params.append(str(filters["date_from"]))
+    if filters.get("date_to"):
+        clauses.append("p.predicted_at < DATE(?, '+1 day')")
+        params.append(str(filters["date_to"]))
+    for key, column, op in [
+        ("cgpa_min", "p.cgpa", ">="), ("cgpa_max", "p.cgpa", "<="),
+        ("aptitude_min", "p.aptitude_score", ">="), ("aptitude_max", "p.aptitude_score", "<="),
+    ]:
+        if filters.get(key) is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(filters[key])
+    if filters.get("placed") is not None:
+        clauses.append("p.placement_status = ?")
+        params.append(int(filters["placed"]))
+
+    where = " AND ".join(clauses) if clauses else "1 = 1"
+    return where, params
+
+@timed("db.query_predictions")
+def query_predictions(
+    filters: Dict[str, Any] | None = None,
+    after: tuple | None = None,
+    page_size: int = 50,
+    include_archive: bool = False
+) -> tuple[List[Dict[str, Any]], tuple | None]:
+    # Newest first. `after` is the (predicted_at, id) cursor returned with the
+    # previous page; the next cursor is None on the last page.
+    where, params = build_prediction_filter(filters)
+    if after is not None:
+        where += " AND (p.predicted_at, p.id) < (?, ?)"
+        params += list(after)
+
+    try:
+        with get_connection() as conn, prediction_tables(conn, include_archive) as tables:
+            select = union_select(tables, f"""
+                SELECT {PREDICTION_COLUMNS}
+                FROM {{table}} p
+                JOIN users u ON p.user_id = u.id
+                WHERE {where}
+            """)
+            cursor = conn.execute(f"""
+                {select}
+                ORDER BY predicted_at DESC, id DESC
+                LIMIT ?
+            """, params * len(tables) + [page_size + 1])
+            rows = [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Query predictions error: {e}")
+        return [], None
+
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1]["predicted_at"], rows[-1]["id"])
+
+EXPORT_COLUMNS = [
+    "id", "username", "cgpa", "internships", "projects", "workshops",
+    "aptitude_score", "soft_skills", "extracurricular", "placement_training",
+    "ssc_marks", "hsc_marks", "placement_status", "predicted_at"
+]
+
+def stream_predictions(filters: Dict[str, Any] | None = None, chunk_size: int = 5000,
+                       include_archive: bool = False) -> Iterator[List[tuple]]:
+    # Yields plain tuples in EXPORT_COLUMNS order, chunk_size rows at a time,
+    # straight from the cursor so memory stays bounded by one chunk
+    where, params = build_prediction_filter(filters)
+    with get_connection() as conn, prediction_tables(conn, include_archive) as tables:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        select = union_select(tables, f"""
+            SELECT {PREDICTION_COLUMNS}
+            FROM {{table}} p
+            JOIN users u ON p.user_id = u.id
+            WHERE {where}
+        """)
+        try:
+            cursor.execute(f"""
+                {select}
+                ORDER BY predicted_at DESC, id DESC
+            """, params * len(tables))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # An unfinished statement would keep the archive from detaching
+            cursor.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Database maintenance")
+    parser.add_argument("command", choices=["init", "rebuild-rollups"])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "rebuild-rollups":
+        if rebuild_rollups():
+            print(get_prediction_summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from cohort_stats import CohortSketch, FEATURE_COLUMNS, FLAG_COLUMNS, ensure_training_histograms, get_sketch
+from database import HISTOGRAM_BINS, get_moments, get_recent_histograms, get_recent_moments
+from query_cache import cached
+
+# ── Input drift ──────────────────────────────────────────────────────────────
+# Compares the profiles students submitted in the last WINDOW_MONTHS calendar
+# months (UTC, the current one included) against the training data, using
+# only the state the database triggers keep up to date on every insert: the
+# per-month live feature histograms and moments, summed over the window.
+# Nothing here reads the predictions table, so a report costs the same for a
+# hundred logged predictions or ten million.
+#
+# Per feature:
+#   PSI   population stability index over PSI_GROUPS groups of histogram
+#         bins, each holding about the same share of the training data
+#   KS    largest gap between the training and live cumulative distributions
+#         (on the histogram bins, so exact to the bin width)
+#   Shift difference in means, in training standard deviations
+# The yes/no flags have no histogram; their PSI and KS come from the share
+# answering yes. Cumulative live state would let years of history outweigh a
+# recent shift, so it only feeds the all-time PSI column.
+WINDOW_MONTHS = 3
+PSI_GROUPS = 10
+PSI_FLOOR = 1e-4     # keeps empty groups out of log(0)
+PSI_WATCH = 0.1
+PSI_ALERT = 0.25
+KS_ALERT = 0.15
+MIN_LIVE_ROWS = 200  # below this the scores are shown but never alert
+
+FEATURE_LABELS = {column: name for name, column in {**FEATURE_COLUMNS, **FLAG_COLUMNS}.items()}
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    e = np.maximum(expected / expected.sum(), PSI_FLOOR)
+    a = np.maximum(actual / actual.sum(), PSI_FLOOR)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+def psi_groups(train_counts: np.ndarray) -> np.ndarray:
+    # Group id per bin: consecutive bins are merged until each group holds
+    # about 1/PSI_GROUPS of the training mass (discrete features get fewer)
+    cumulative = np.cumsum(train_counts) - train_counts / 2
+    return np.minimum((cumulative / train_counts.sum() * PSI_GROUPS).astype(np.int64), PSI_GROUPS - 1)
+
+def histogram_scores(train_counts: np.ndarray, live_counts: np.ndarray) -> tuple[float, float]:
+    groups = psi_groups(train_counts)
+    expected = np.bincount(groups, weights=train_counts, minlength=PSI_GROUPS)
+    actual = np.bincount(groups, weights=live_counts, minlength=PSI_GROUPS)
+    ks = np.max(np.abs(np.cumsum(train_counts) / train_counts.sum() - np.cumsum(live_counts) / live_counts.sum()))
+    return psi(expected, actual), float(ks)
+
+def _mean_std(moments: tuple) -> tuple[float, float]:
+    count, total, total_sq = moments
+    mean = total / count
+    return mean, float(np.sqrt(max(total_sq / count - mean * mean, 0.0)))
+
+def _status(live_rows: int, psi_score: float, ks: float) -> str:
+    if live_rows < MIN_LIVE_ROWS:
+        return "too few rows"
+    if psi_score >= PSI_ALERT or ks >= KS_ALERT:
+        return "alert"
+    if psi_score >= PSI_WATCH:
+        return "watch"
+    return "ok"
+
+def window_start(months: int = WINDOW_MONTHS, now: datetime | None = None) -> str:
+    # 'YYYY-MM' of the oldest month in the window: with 3 months in
+    # 2026-10, the window is 2026-08 to 2026-10
+    now = now or datetime.now(timezone.utc)
+    year, month = divmod(now.year * 12 + now.month - months, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+def _compute_report(since: str) -> pd.DataFrame:
+    training, live = get_sketch("training"), CohortSketch(get_recent_histograms(since))
+    all_time = get_sketch("live")
+    train_moments, live_moments = get_moments("training"), get_recent_moments(since)
+    all_time_moments = get_moments("live")
+
+    records = []
+    for column, label in FEATURE_LABELS.items():
+        if column not in train_moments or column not in live_moments:
+            continue
+        if column in HISTOGRAM_BINS and not (training.total("all", column) and live.total("all", column)):
+            continue
+        live_rows = live_moments[column][0]
+        train_mean, train_std = _mean_std(train_moments[column])
+        live_mean, _ = _mean_std(live_moments[column])
+
+        if column in HISTOGRAM_BINS:
+            psi_score, ks = histogram_scores(training.counts("all", column), live.counts("all", column))
+            psi_all_time, _ = histogram_scores(training.counts("all", column), all_time.counts("all", column))
+        else:
+            # Yes/no: two buckets, the share answering yes and the rest
+            psi_score = psi(np.array([train_mean, 1 - train_mean]), np.array([live_mean, 1 - live_mean]))
+            ks = abs(live_mean - train_mean)
+            all_time_mean, _ = _mean_std(all_time_moments[column])
+            psi_all_time = psi(np.array([train_mean, 1 - train_mean]), np.array([all_time_mean, 1 - all_time_mean]))
+
+        records.append({
+            "Feature": label,
+            "Live Rows": live_rows,
+            "Training Mean": train_mean,
+            "Live Mean": live_mean,
+            "Shift (SD)": (live_mean - train_mean) / train_std if train_std else 0.0,
+            "PSI": psi_score,
+            "KS": ks,
+            "PSI (All Time)": psi_all_time,
+            "Status": _status(live_rows, psi_score, ks),
+        })
+    return pd.DataFrame(records)
+
+def drift_report() -> pd.DataFrame:
+    # Empty until a prediction has been logged within the window
+    ensure_training_histograms()
+    return cached("drift_report", _compute_report, window_start())
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+
+from inference import FEATURE_ORDER, TIER_ENCODER_PATH, TIER_MODEL_PATH
+
+FOREST_DIR = "models/company_tier_forest"
+
+ARRAY_NAMES = ["feature", "threshold", "left", "right", "leaf_slot", "leaf_value", "roots"]
+
+# ── Export ───────────────────────────────────────────────────────────────────
+# The whole forest is flattened into one set of contiguous arrays:
+#   feature/threshold/left/right  one entry per node, children as global indices
+#   leaf_slot                     row of leaf_value for every node (-1 for splits)
+#   leaf_value                    class distribution per leaf
+#   roots                         index of each tree's root node
+# Leaves point to themselves, so a batch can be pushed down every tree with a
+# fixed number of vectorized steps.
+
+def _flatten_tree(tree, offset: int, max_depth: int | None):
+    t = tree.tree_
+    n = t.node_count
+
+    depth = np.zeros(n, dtype=np.int32)
+    for node in range(n):
+        if t.children_left[node] != -1:
+            depth[t.children_left[node]] = depth[node] + 1
+            depth[t.children_right[node]] = depth[node] + 1
+
+    is_leaf = t.children_left == -1
+    if max_depth is not None:
+        is_leaf = is_leaf | (depth >= max_depth)
+
+    # Keep only nodes still reachable after pruning, renumbered in DFS order
+    keep = []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        keep.append(node)
+        if not is_leaf[node]:
+            stack.append(t.children_right[node])
+            stack.append(t.children_left[node])
+    remap = {node: offset + i for i, node in enumerate(keep)}
+
+    feature = np.empty(len(keep), dtype=np.int16)
+    threshold = np.empty(len(keep), dtype=np.float64)
+    left = np.empty(len(keep), dtype=np.int32)
+    right = np.empty(len(keep), dtype=np.int32)
+    leaves = []
+
+    for i, node in enumerate(keep):
+        if is_leaf[node]:
+            feature[i] = 0
+            threshold[i] = np.inf
+            left[i] = right[i] = offset + i
+            # value is stored as class fractions; pruned internal nodes keep
+            # the distribution of the samples that reached them
+            dist = t.value[node][0]
+            leaves.append((i, dist / dist.sum()))
+        else:
+            feature[i] = t.feature[node]
+            threshold[i] = t.threshold[node]
+            left[i] = remap[t.children_left[node]]
+            right[i] = remap[t.children_right[node]]
+
+    return feature, threshold, left, right, leaves, int(depth[keep].max())
+
+def export_forest(model, encoder, path: str = FOREST_DIR, n_trees: int | None = None,
+                  max_depth: int | None = None, quantize: bool = False,
+                  source_sha256: str | None = None) -> dict:
+    estimators = model.estimators_[:n_trees] if n_trees else model.estimators_
+
+    parts = {name: [] for name in ["feature", "threshold", "left", "right", "leaf_slot"]}
+    leaf_values = []
+    roots = []
+    offset = 0
+    depth = 0
+
+    for est in estimators:
+        feature, threshold, left, right, leaves, tree_depth = _flatten_tree(est, offset, max_depth)
+        slot = np.full(len(feature), -1, dtype=np.int32)
+        for i, dist in leaves:
+            slot[i] = len(leaf_values)
+            leaf_values.append(dist)
+
+        roots.append(offset)
+        for name, arr in zip(["feature", "threshold", "left", "right", "leaf_slot"],
+                             [feature, threshold, left, right, slot]):
+            parts[name].append(arr)
+        offset += len(feature)
+        depth = max(depth, tree_depth)
+
+    arrays = {name: np.concatenate(chunks) for name, chunks in parts.items()}
+    arrays["roots"] = np.asarray(roots, dtype=np.int32)
+    leaf_value = np.asarray(leaf_values, dtype=np.float64)
+
+    # Inputs are compared as float32, so rounding each threshold down to the
+    # nearest float32 gives exactly the same splits at half the size.
+    threshold = arrays["threshold"]
+    threshold32 = threshold.astype(np.float32)
+    over = threshold32 > threshold
+    threshold32[over] = np.nextafter(threshold32[over], np.float32(-np.inf))
+    arrays["threshold"] = threshold32
+
+    if quantize:
+        # 8-bit leaf probabilities: an eighth of the leaf table, at the cost of
+        # occasional flips between near-tied classes
+        arrays["leaf_value"] = np.round(leaf_value * 255).astype(np.uint8)
+    else:
+        arrays["leaf_value"] = leaf_value
+
+    os.makedirs(path, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(arrays[name]))
+
+    meta = {
+        "feature_order": FEATURE_ORDER,
+        "classes": [int(c) for c in model.classes_],
+        "labels": [str(label) for label in encoder.classes_],
+        "n_trees": len(estimators),
+        "n_nodes": int(offset),
+        "max_depth": depth,
+        "pruned_depth": max_depth,
+        "quantized": quantize,
+        # sha256 of the pickles exported from, checked by the model registry
+        "source_sha256": source_sha256,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+# ── Inference ────────────────────────────────────────────────────────────────
+class CompactForest:
+    def __init__(self, arrays: dict, meta: dict):
+        self.meta = meta
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.leaf_slot = arrays["leaf_slot"]
+        self.leaf_value = arrays["leaf_value"]
+        self.roots = arrays["roots"]
+        self.depth = meta["max_depth"]
+        self.classes = np.asarray(meta["classes"])
+        self.labels = np.asarray(meta["labels"], dtype=object)
+        self.scale = 255.0 if self.leaf_value.dtype == np.uint8 else 1.0
+
+    @classmethod
+    def load(cls, path: str = FOREST_DIR, mmap: bool = False) -> "CompactForest":
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in ARRAY_NAMES}
+        return cls(arrays, meta)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAY_NAMES)
+
+    def _leaves(self, X) -> np.ndarray:
+        # sklearn compares float32 inputs against the split thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n_trees = len(self.roots)
+        flat_X = X.ravel()
+        nodes = np.tile(self.roots, len(X))
+        # Offset of each (sample, tree) pair's row in the flattened input
+        row_start = np.repeat(np.arange(len(X), dtype=np.intp) * X.shape[1], n_trees)
+
+        # Only pairs still sitting on a split node are advanced each step, so
+        # shallow trees drop out of the working set early
+        active = np.arange(len(nodes))
+        for _ in range(self.depth):
+            current = nodes[active]
+            go_left = flat_X[row_start[active] + self.feature[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            still_split = self.leaf_slot[current] < 0
+            if not still_split.any():
+                break
+            active = active[still_split]
+        return nodes.reshape(len(X), n_trees)
+
+    def predict_proba(self, X) -> np.ndarray:
+        values = self.leaf_value[self.leaf_slot[self._leaves(X)]]
+        return values.sum(axis=1, dtype=np.float64) / (len(self.roots) * self.scale)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_labels(self, X) -> np.ndarray:
+        # Encoded class -> tier label, replacing the separate LabelEncoder call
+        return self.labels[np.argmax(self.predict_proba(X), axis=1)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the company-tier RandomForest to compact NumPy arrays")
+    parser.add_argument("--out", default=FOREST_DIR)
+    parser.add_argument("--n-trees", type=int, default=None, help="Keep only the first N trees")
+    parser.add_argument("--max-depth", type=int, default=None, help="Collapse every subtree below this depth into a leaf")
+    parser.add_argument("--quantize", action="store_true", help="Store leaf probabilities as 8-bit integers")
+    args = parser.parse_args()
+
+    with open(TIER_MODEL_PATH, "rb") as f:
+        model = pickle.load(f)
+    with open(TIER_ENCODER_PATH, "rb") as f:
+        encoder = pickle.load(f)
+
+    meta = export_forest(model, encoder, args.out, args.n_trees, args.max_depth, args.quantize)
+    size = sum(os.path.getsize(os.path.join(args.out, f"{name}.npy")) for name in ARRAY_NAMES)
+    print(f"Exported {meta['n_trees']} trees / {meta['n_nodes']:,} nodes (depth {meta['max_depth']}) "
+          f"to {args.out} ({size / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import pickle
+import numpy as np
+import pandas as pd
+
+PLACEMENT_MODEL_PATH = "models/placement_status_model.pkl"
+TIER_MODEL_PATH = "models/company_tier_model.pkl"
+TIER_ENCODER_PATH = "models/company_tier_encoder.pkl"
+
+# Column order the models were trained on (see notebooks/02 and 03)
+FEATURE_ORDER = [
+    "CGPA", "Internships", "Projects", "Workshops/Certifications",
+    "AptitudeTestScore", "SoftSkillsRating", "ExtracurricularActivities",
+    "PlacementTraining", "SSC_Marks", "HSC_Marks"
+]
+
+BINARY_FEATURES = ["ExtracurricularActivities", "PlacementTraining"]
+
+binary_map = {"Yes": 1, "No": 0}
+
+def _load_pickle(path: str):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def load_models():
+    placement = _load_pickle(PLACEMENT_MODEL_PATH)
+    tier_model = _load_pickle(TIER_MODEL_PATH)
+    tier_encoder = _load_pickle(TIER_ENCODER_PATH)
+    return placement, tier_model, tier_encoder
+
+def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
+    missing = [col for col in FEATURE_ORDER if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    X = df[FEATURE_ORDER].copy()
+    # Raw exports use Yes/No, the processed dataset already uses 1/0
+    for col in BINARY_FEATURES:
+        if X[col].dtype == object:
+            X[col] = X[col].astype(str).str.strip().map(binary_map)
+    if X.isnull().any().any():
+        raise ValueError("Feature columns contain missing or unrecognised values")
+    return X
+
+def predict_batch(placement_scorer, tier_predictor, X):
+    # X: 2-D array with columns in FEATURE_ORDER. One vectorized call per
+    # model; the label comes from the same decision as the probability.
+    X = np.asarray(X, dtype=np.float64)
+    prob, placed = placement_scorer.score_batch(X)
+
+    # Company tier is only meaningful for students predicted as placed
+    tiers = np.full(len(X), None, dtype=object)
+    placed_mask = placed == 1
+    if placed_mask.any():
+        tiers[placed_mask] = tier_predictor.predict_labels(X[placed_mask])
+
+    return placed, prob, tiers
@@ -0,0 +1,289 @@
+import bisect
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Dict, List
+
+# ── Instrumentation ──────────────────────────────────────────────────────────
+# Stage timings are kept in memory as fixed-bucket histograms (one per stage
+# name such as "db.get_user_predictions" or "auth.bcrypt_verify"), so
+# recording is a bisect and two additions under a lock. p50/p95/p99 are read
+# off the buckets, interpolated within the bucket that holds the rank.
+#
+# SQL statements run through InstrumentedConnection and are timed from
+# execute() until their last row is fetched; any statement slower than
+# SLOW_QUERY_MS is logged with its query plan and kept in a short ring
+# buffer for the admin System Health tab.
+#
+# METRICS_ENABLED=0 turns all of this off: timed() returns the function
+# unchanged, timer() returns a shared no-op context manager and database
+# connections use the plain sqlite3 classes. With METRICS_EXPORT_PATH set,
+# a Prometheus text file is rewritten every METRICS_EXPORT_INTERVAL_SECONDS.
+ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG_SIZE = 100
+ITER_BATCH_ROWS = 256
+METRICS_EXPORT_PATH = os.environ.get("METRICS_EXPORT_PATH")
+METRICS_EXPORT_INTERVAL_SECONDS = 15.0
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf
+BUCKETS = [
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"),
+]
+
+logger = logging.getLogger("placement.slow_query")
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = min(BUCKETS[i], self.max)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+_histograms: Dict[str, Histogram] = {}
+_slow_queries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_lock = threading.Lock()
+_noop = nullcontext()
+
+def observe(stage: str, seconds: float) -> None:
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds)
+
+@contextmanager
+def _timer(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+def timer(stage: str):
+    return _timer(stage) if ENABLED else _noop
+
+def timed(stage: str):
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def snapshot() -> List[Dict[str, Any]]:
+    # One row per stage, timings in milliseconds
+    with _lock:
+        return [
+            {
+                "stage": stage,
+                "count": h.count,
+                "p50_ms": h.quantile(0.50) * 1000,
+                "p95_ms": h.quantile(0.95) * 1000,
+                "p99_ms": h.quantile(0.99) * 1000,
+                "max_ms": h.max * 1000,
+                "total_s": h.sum,
+            }
+            for stage, h in sorted(_histograms.items())
+        ]
+
+def slow_queries() -> List[Dict[str, Any]]:
+    with _lock:
+        return list(reversed(_slow_queries))
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _slow_queries.clear()
+
+def prometheus_text() -> str:
+    lines = [
+        "# HELP placement_stage_seconds Time spent per instrumented stage",
+        "# TYPE placement_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage, h in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'placement_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'placement_stage_seconds_sum{{stage="{stage}"}} {h.sum}')
+            lines.append(f'placement_stage_seconds_count{{stage="{stage}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path: str) -> None:
+    # Written to a temporary file and renamed, so scrapers never see half a file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+def _export_loop(path: str) -> None:
+    while True:
+        time.sleep(METRICS_EXPORT_INTERVAL_SECONDS)
+        try:
+            write_prometheus(path)
+        except OSError as e:
+            logger.warning("Metrics export to %s failed: %s", path, e)
+
+# ── SQL timing ───────────────────────────────────────────────────────────────
+def _record_sql(conn: sqlite3.Connection, sql: str, seconds: float) -> None:
+    statement = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "?"
+    observe(f"sql.{statement.lower()}", seconds)
+    if seconds * 1000 < SLOW_QUERY_MS:
+        return
+
+    plan = []
+    if statement in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH"):
+        try:
+            # Plain cursor: the plan lookup itself must not be timed or logged
+            cursor = sqlite3.Cursor(conn)
+            cursor.row_factory = None
+            plan = [row[-1] for row in cursor.execute("EXPLAIN QUERY PLAN " + sql, _plan_params(sql))]
+        except sqlite3.Error:
+            plan = []
+    entry = {
+        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "ms": seconds * 1000,
+        "sql": " ".join(sql.split()),
+        "plan": plan,
+    }
+    with _lock:
+        _slow_queries.append(entry)
+    # Parameters are never logged: they include password hashes
+    logger.warning("Slow query (%.1f ms): %s | plan: %s", entry["ms"], entry["sql"], "; ".join(plan))
+
+def _plan_params(sql: str) -> tuple:
+    # EXPLAIN QUERY PLAN needs every placeholder bound, but not the real values
+    return (None,) * sql.count("?")
+
+class InstrumentedCursor(sqlite3.Cursor):
+    # A SELECT does most of its work while rows are stepped, not in execute(),
+    # so a statement's time is execute() plus every fetch. It is recorded once
+    # the rows run out, or when the cursor is reused, closed or dropped with
+    # rows left unread (e.g. a single fetchone()).
+    _pending = None  # [sql, seconds so far]
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            _record_sql(self.connection, *pending)
+
+    def _run(self, run, sql, parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            run(sql, parameters)
+        except BaseException:
+            _record_sql(self.connection, sql, time.perf_counter() - start)
+            raise
+        self._pending = [sql, time.perf_counter() - start]
+        if self.description is None:
+            # No result rows, so nothing left to time
+            self._finish()
+        return self
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            if self._pending is not None:
+                self._pending[1] += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._fetch(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._fetch(super().fetchmany, size)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        # In batches, so looping over rows costs a clock read per batch rather
+        # than a Python call per row
+        while True:
+            rows = self.fetchmany(ITER_BATCH_ROWS)
+            yield from rows
+            if len(rows) < ITER_BATCH_ROWS:
+                return
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def connection_factory():
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
+
+# Not from pool workers (password_pool), which would overwrite the file with empty histograms
+if ENABLED and METRICS_EXPORT_PATH and multiprocessing.parent_process() is None:
+    threading.Thread(target=_export_loop, args=(METRICS_EXPORT_PATH,), name="metrics-export", daemon=True).start()
@@ -0,0 +1,196 @@
+import argparse
+import hashlib
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from forest_engine import FOREST_DIR, CompactForest, export_forest
+import metrics
+from inference import FEATURE_ORDER, PLACEMENT_MODEL_PATH, TIER_ENCODER_PATH, TIER_MODEL_PATH
+from placement_scorer import SCORER_PATH, PlacementScorer
+
+# ── Model registry ───────────────────────────────────────────────────────────
+# Artifacts are loaded on first use rather than at import, once per process.
+# The company-tier forest is read from its .npy export with mmap_mode="r", so
+# every app process on the host maps the same page-cache pages instead of
+# unpickling a private copy. The placement scorer loads from its .npz export,
+# which avoids importing scikit-learn at all on the prediction path.
+# Re-run `python app/model_registry.py export` after retraining. Each export
+# records the sha256 of the pickles it came from; an export whose pickles
+# have since changed (or that predates the check) is ignored in favour of
+# the pickles, so a swapped-in model is never served with stale parameters.
+#
+# version() stats the artifact files (at most every VERSION_CHECK_INTERVAL_SECONDS)
+# and drops any loaded model whose files changed since it was loaded, so a
+# retrain is picked up without restarting the app.
+VERSION_CHECK_INTERVAL_SECONDS = 2.0
+
+def artifact_signature(paths: List[str]) -> Tuple:
+    sig = []
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                st = entry.stat()
+                sig.append((entry.path, st.st_mtime_ns, st.st_size))
+        elif os.path.exists(path):
+            st = os.stat(path)
+            sig.append((path, st.st_mtime_ns, st.st_size))
+        else:
+            sig.append((path, None, None))
+    return tuple(sig)
+
+def sources_sha256(paths: List[str]) -> str | None:
+    # One digest over the contents of paths, in order; None if any is missing
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def _is_current(recorded: str | None, sources: List[str]) -> bool:
+    current = sources_sha256(sources)
+    # Only the export is left to serve from
+    if current is None:
+        return True
+    return recorded == current
+
+class SklearnTierPredictor:
+    # Fallback with the CompactForest interface when the array export is missing
+    def __init__(self, model, encoder):
+        self.model = model
+        self.encoder = encoder
+
+    def predict_labels(self, X):
+        import pandas as pd
+        X = pd.DataFrame(X, columns=FEATURE_ORDER)
+        return self.encoder.inverse_transform(self.model.predict(X))
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._paths: Dict[str, List[str]] = {}
+        self._models: Dict[str, Any] = {}
+        self._signatures: Dict[str, Tuple] = {}
+        self._version: int | None = None
+        self._version_checked = 0.0
+        # Re-entrant: some loaders build on other registered artifacts
+        self._lock = threading.RLock()
+        self.load_times: Dict[str, float] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], paths: List[str]) -> None:
+        self._loaders[name] = loader
+        self._paths[name] = paths
+
+    def get(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                start = time.perf_counter()
+                self._signatures[name] = artifact_signature(self._paths[name])
+                self._models[name] = self._loaders[name]()
+                self.load_times[name] = time.perf_counter() - start
+                metrics.observe(f"model.load.{name}", self.load_times[name])
+            return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def version(self) -> int:
+        # Hash of every registered artifact's (path, mtime, size)
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked < VERSION_CHECK_INTERVAL_SECONDS:
+            return self._version
+
+        with self._lock:
+            signatures = {name: artifact_signature(paths) for name, paths in self._paths.items()}
+            for name, sig in signatures.items():
+                if name in self._models and self._signatures.get(name) != sig:
+                    del self._models[name]
+                    self.load_times.pop(name, None)
+            self._version = hash(tuple(signatures.items()))
+            self._version_checked = now
+            return self._version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._signatures.clear()
+            self.load_times.clear()
+            self._version = None
+
+def _load_pickle(path: str):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+PLACEMENT_SOURCES = [PLACEMENT_MODEL_PATH]
+TIER_SOURCES = [TIER_MODEL_PATH, TIER_ENCODER_PATH]
+
+def _stale(export_path: str) -> None:
+    print(f"{export_path} does not match its pickles; serving from the pickles. "
+          f"Run `python app/model_registry.py export` to refresh it.")
+
+def _load_placement_scorer():
+    if os.path.exists(SCORER_PATH):
+        scorer = PlacementScorer.load(SCORER_PATH)
+        if _is_current(scorer.source_sha256, PLACEMENT_SOURCES):
+            return scorer
+        _stale(SCORER_PATH)
+    return PlacementScorer.from_model(registry.get("placement_model"))
+
+def _load_tier_predictor():
+    if os.path.isdir(FOREST_DIR):
+        forest = CompactForest.load(FOREST_DIR, mmap=True)
+        if _is_current(forest.meta.get("source_sha256"), TIER_SOURCES):
+            return forest
+        _stale(FOREST_DIR)
+    return SklearnTierPredictor(registry.get("tier_model"), registry.get("tier_encoder"))
+
+registry = ModelRegistry()
+registry.register("placement_model", lambda: _load_pickle(PLACEMENT_MODEL_PATH), [PLACEMENT_MODEL_PATH])
+registry.register("placement_scorer", _load_placement_scorer, [SCORER_PATH, PLACEMENT_MODEL_PATH])
+registry.register("tier_model", lambda: _load_pickle(TIER_MODEL_PATH), [TIER_MODEL_PATH])
+registry.register("tier_encoder", lambda: _load_pickle(TIER_ENCODER_PATH), [TIER_ENCODER_PATH])
+registry.register("tier_predictor", _load_tier_predictor, [FOREST_DIR, TIER_MODEL_PATH, TIER_ENCODER_PATH])
+
+def get_placement_scorer() -> PlacementScorer:
+    return registry.get("placement_scorer")
+
+def get_tier_predictor():
+    return registry.get("tier_predictor")
+
+def get_model_version() -> int:
+    return registry.version()
+
+def export_all() -> None:
+    PlacementScorer.from_model(registry.get("placement_model")).save(
+        SCORER_PATH, source_sha256=sources_sha256(PLACEMENT_SOURCES))
+    export_forest(registry.get("tier_model"), registry.get("tier_encoder"), FOREST_DIR,
+                  source_sha256=sources_sha256(TIER_SOURCES))
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect the model artifacts")
+    parser.add_argument("command", choices=["export", "report"],
+                        help="export: write the .npz/.npy artifacts from the pickles; "
+                             "report: cold-load every artifact and print its load time")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_all()
+        print(f"Exported {SCORER_PATH} and {FOREST_DIR}")
+        return
+
+    for name in ["placement_scorer", "tier_predictor"]:
+        registry.get(name)
+    for name, seconds in registry.load_times.items():
+        print(f"{name:18} {seconds * 1000:8.1f} ms  ({', '.join(registry._paths[name])})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Tuple
+
+import bcrypt
+
+from metrics import timed
+
+# ── Password hashing pool ────────────────────────────────────────────────────
+# bcrypt at cost 12 is ~250 ms of CPU per call. Running it on the Streamlit
+# script thread holds up every other session during a login burst, so hashes
+# and checks run in a process pool instead. At most MAX_PENDING operations may
+# be queued or running; beyond that callers wait up to ADMISSION_TIMEOUT_SECONDS
+# and then get PasswordPoolBusy rather than piling up unbounded work.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+MAX_WORKERS = os.cpu_count() or 2
+MAX_PENDING = MAX_WORKERS * 8
+ADMISSION_TIMEOUT_SECONDS = 10.0
+
+_COST_PATTERN = re.compile(rb"^\$2[abxy]?\$(\d{2})\$")
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_admission = threading.BoundedSemaphore(MAX_PENDING)
+
+class PasswordPoolBusy(RuntimeError):
+    pass
+
+def _hash(password: str, rounds: int) -> bytes:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
+
+def _check(password: str, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed)
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: forking the multi-threaded Streamlit server is unsafe
+                _executor = ProcessPoolExecutor(
+                    max_workers=MAX_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+def _submit(fn, *args):
+    if not _admission.acquire(timeout=ADMISSION_TIMEOUT_SECONDS):
+        raise PasswordPoolBusy("Too many sign-ins in progress, please try again")
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _admission.release()
+
+@timed("auth.bcrypt_hash")
+def hash_password(password: str, rounds: int | None = None) -> bytes:
+    return _submit(_hash, password, rounds or BCRYPT_ROUNDS)
+
+@timed("auth.bcrypt_verify")
+def verify_password(password: str, hashed: bytes) -> bool:
+    return _submit(_check, password, hashed)
+
+def hash_cost(hashed: bytes) -> int | None:
+    match = _COST_PATTERN.match(hashed)
+    return int(match.group(1)) if match else None
+
+def needs_rehash(hashed: bytes) -> bool:
+    return hash_cost(hashed) != BCRYPT_ROUNDS
+
+def verify_and_rehash(password: str, hashed: bytes) -> Tuple[bool, bytes | None]:
+    # On success, also returns a fresh hash when the stored one was made with
+    # a different cost factor than BCRYPT_ROUNDS, so it can be upgraded
+    if not verify_password(password, hashed):
+        return False, None
+    if needs_rehash(hashed):
+        return True, hash_password(password)
+    return True, None
+
+def hash_many(passwords: List[str], rounds: int | None = None) -> List[bytes]:
+    # Bulk jobs get their own short-lived pool across all cores, so they do
+    # not take admission slots away from interactive logins
+    rounds = rounds or BCRYPT_ROUNDS
+    chunksize = max(1, len(passwords) // (MAX_WORKERS * 4))
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_hash, passwords, repeat(rounds), chunksize=chunksize))
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
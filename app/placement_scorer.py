@@ -0,0 +1,94 @@
+import math
+import pickle
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from inference import FEATURE_ORDER, PLACEMENT_MODEL_PATH
+
+SCORER_PATH = "models/placement_scorer.npz"
+
+def _expit(z: np.ndarray) -> np.ndarray:
+    # Stable logistic in NumPy; scipy.special.expit costs ~100 ms to import,
+    # which the student page would otherwise pay on first render
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+
+class PlacementScorer:
+    # Fast path for the binary LogisticRegression in models/placement_status_model.pkl.
+    # The coefficients are pulled out once, so a prediction is a single dot product
+    # on a preallocated vector instead of DataFrame construction plus separate
+    # predict_proba() and predict() calls that both recompute the decision function.
+
+    def __init__(self, coef, intercept: float, classes):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.negative_label = int(classes[0])
+        self.positive_label = int(classes[1])
+        # sha256 of the pickle this was exported from, when loaded from an export
+        self.source_sha256: str | None = None
+        self._local = threading.local()
+
+    @classmethod
+    def from_model(cls, model) -> "PlacementScorer":
+        classes = list(model.classes_)
+        if model.coef_.shape[0] != 1 or len(classes) != 2:
+            raise ValueError("PlacementScorer only supports a binary logistic regression")
+
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None and list(names) != FEATURE_ORDER:
+            raise ValueError("Model was trained on a different feature order")
+
+        return cls(model.coef_[0], model.intercept_[0], classes)
+
+    @classmethod
+    def from_pickle(cls, path: str = PLACEMENT_MODEL_PATH) -> "PlacementScorer":
+        with open(path, "rb") as f:
+            return cls.from_model(pickle.load(f))
+
+    # The .npz export needs only NumPy to load, so scoring does not pay for
+    # importing scikit-learn to unpickle the model
+    def save(self, path: str = SCORER_PATH, source_sha256: str | None = None) -> None:
+        extra = {"source_sha256": np.array(source_sha256)} if source_sha256 else {}
+        np.savez(path, coef=self.coef, intercept=self.intercept,
+                 classes=np.array([self.negative_label, self.positive_label]), **extra)
+
+    @classmethod
+    def load(cls, path: str = SCORER_PATH) -> "PlacementScorer":
+        with np.load(path) as data:
+            scorer = cls(data["coef"], data["intercept"], data["classes"])
+            if "source_sha256" in data.files:
+                scorer.source_sha256 = str(data["source_sha256"])
+        return scorer
+
+    def _buffer(self) -> np.ndarray:
+        # One reusable vector per thread; Streamlit runs sessions on separate threads
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = np.empty(len(FEATURE_ORDER), dtype=np.float64)
+        return buf
+
+    def score(self, features: Dict[str, float]) -> Tuple[float, int]:
+        x = self._buffer()
+        for i, name in enumerate(FEATURE_ORDER):
+            x[i] = features[name]
+
+        z = float(np.dot(x, self.coef)) + self.intercept
+        # Numerically stable logistic, matching sklearn's expit
+        if z >= 0:
+            prob = 1.0 / (1.0 + math.exp(-z))
+        else:
+            e = math.exp(z)
+            prob = e / (1.0 + e)
+
+        # sklearn predicts the positive class only when the decision is strictly > 0
+        label = self.positive_label if z > 0 else self.negative_label
+        return prob, label
+
+    def score_batch(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        # X: 2-D array-like with columns in FEATURE_ORDER
+        z = np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+        prob = _expit(z)
+        labels = np.where(z > 0, self.positive_label, self.negative_label)
+        return prob, labels
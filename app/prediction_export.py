@@ -0,0 +1,145 @@
+import argparse
+import csv
+import io
+import time
+from typing import Any, Dict
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from database import EXPORT_COLUMNS, init_db, stream_predictions
+
+# ── Streaming exports ────────────────────────────────────────────────────────
+# Rows come from the SQLite cursor chunk_size at a time and are written out
+# before the next chunk is fetched, so memory is bounded by one chunk no
+# matter how large the predictions table is. Exports cover the full history,
+# archived months included, unless include_archive is False.
+DEFAULT_CHUNK_SIZE = 10000
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("username", pa.string()),
+    ("cgpa", pa.float64()),
+    ("internships", pa.int16()),
+    ("projects", pa.int16()),
+    ("workshops", pa.int16()),
+    ("aptitude_score", pa.int16()),
+    ("soft_skills", pa.float64()),
+    ("extracurricular", pa.int8()),
+    ("placement_training", pa.int8()),
+    ("ssc_marks", pa.float64()),
+    ("hsc_marks", pa.float64()),
+    ("placement_status", pa.int8()),
+    ("predicted_at", pa.string()),
+])
+
+def _record_batch(rows) -> pa.RecordBatch:
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(col, type=field.type) for col, field in zip(columns, EXPORT_SCHEMA)],
+        schema=EXPORT_SCHEMA
+    )
+
+def write_csv(out, filters: Dict[str, Any] | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              include_archive: bool = True) -> int:
+    # out: text file object opened with newline=""
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    rows = 0
+    for chunk in stream_predictions(filters, chunk_size, include_archive):
+        writer.writerows(chunk)
+        rows += len(chunk)
+    return rows
+
+def write_parquet(out, filters: Dict[str, Any] | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  include_archive: bool = True) -> int:
+    # One row group per chunk
+    rows = 0
+    with pq.ParquetWriter(out, EXPORT_SCHEMA, compression="zstd") as writer:
+        for chunk in stream_predictions(filters, chunk_size, include_archive):
+            writer.write_batch(_record_batch(chunk))
+            rows += len(chunk)
+    return rows
+
+def write_arrow(out, filters: Dict[str, Any] | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                include_archive: bool = True) -> int:
+    # Arrow IPC file, readable zero-copy with pyarrow.memory_map
+    rows = 0
+    with ipc.new_file(out, EXPORT_SCHEMA) as writer:
+        for chunk in stream_predictions(filters, chunk_size, include_archive):
+            writer.write_batch(_record_batch(chunk))
+            rows += len(chunk)
+    return rows
+
+def export_predictions(path: str, fmt: str = "csv", filters: Dict[str, Any] | None = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE, include_archive: bool = True) -> Dict[str, Any]:
+    start = time.perf_counter()
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            rows = write_csv(f, filters, chunk_size, include_archive)
+    elif fmt == "parquet":
+        rows = write_parquet(path, filters, chunk_size, include_archive)
+    elif fmt == "arrow":
+        rows = write_arrow(path, filters, chunk_size, include_archive)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds > 0 else 0.0}
+
+def export_bytes(fmt: str = "csv", filters: Dict[str, Any] | None = None, include_archive: bool = True) -> bytes:
+    # For st.download_button, which holds the whole payload in memory anyway;
+    # exports too large for that belong on the command line (main() below)
+    out = io.BytesIO()
+    if fmt == "csv":
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        write_csv(text, filters, include_archive=include_archive)
+        text.flush()
+        # Detached so the wrapper does not close the buffer when collected
+        text.detach()
+    elif fmt == "parquet":
+        write_parquet(out, filters, include_archive=include_archive)
+    elif fmt == "arrow":
+        write_arrow(out, filters, include_archive=include_archive)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return out.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream prediction records to CSV, Parquet or Arrow")
+    parser.add_argument("out", help="Output file path")
+    parser.add_argument("--format", choices=list(FORMATS), default=None,
+                        help="Defaults to the output file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--student")
+    parser.add_argument("--date-from", help="YYYY-MM-DD")
+    parser.add_argument("--date-to", help="YYYY-MM-DD")
+    parser.add_argument("--cgpa-min", type=float)
+    parser.add_argument("--cgpa-max", type=float)
+    parser.add_argument("--aptitude-min", type=int)
+    parser.add_argument("--aptitude-max", type=int)
+    parser.add_argument("--placed", type=int, choices=[0, 1])
+    parser.add_argument("--hot-only", action="store_true", help="Skip rows moved to the archive by retention.py")
+    args = parser.parse_args()
+
+    fmt = args.format or args.out.rsplit(".", 1)[-1].lower()
+    filters = {
+        key: getattr(args, key)
+        for key in ["student", "date_from", "date_to", "cgpa_min", "cgpa_max",
+                    "aptitude_min", "aptitude_max", "placed"]
+    }
+
+    init_db()
+    stats = export_predictions(args.out, fmt, filters, args.chunk_size, not args.hot_only)
+    print(f"Exported {stats['rows']:,} rows to {args.out} in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# ── Write-behind prediction log ──────────────────────────────────────────────
+# Rows are queued in-process and a background thread drains them with one
+# executemany per batch (group commit), so the request thread never waits on
+# an fsync. A batch is flushed when it reaches batch_size rows or when the
+# oldest queued row is flush_interval seconds old, and once more on stop().
+#
+# A batch that fails with an error retry_on() accepts (a locked or full
+# database, say) is held and retried with exponential backoff before any
+# newer rows are written, so rows are delayed, not lost; new rows keep
+# queueing until the queue is full, when submit() makes callers write
+# synchronously. Other errors mean the rows can never be written, and the
+# batch is dropped and counted in failed_rows. stop() gives a held batch
+# STOP_RETRIES more tries.
+STOP_RETRIES = 3
+
+class PredictionWriter:
+    def __init__(
+        self,
+        flush_fn: Callable[[List[tuple]], int],
+        batch_size: int = 500,
+        flush_interval: float = 0.25,
+        max_queue: int = 50000,
+        retry_on: Callable[[Exception], bool] = lambda e: False,
+        retry_backoff: float = 0.1,
+        max_retry_backoff: float = 5.0
+    ):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_on = retry_on
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._held: List[tuple] | None = None
+        self._backoff = retry_backoff
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.flushed_rows = 0
+        self.failed_rows = 0
+        self.retried_flushes = 0
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, row: tuple) -> bool:
+        # False when the queue is full; the caller should write synchronously
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        # Anything queued after the thread exited
+        self._drain_remaining()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "held_rows": len(self._held) if self._held else 0,
+            "flushed_rows": self.flushed_rows,
+            "failed_rows": self.failed_rows,
+            "retried_flushes": self.retried_flushes,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_seconds * 1000,
+            "avg_flush_ms": self.total_flush_seconds / self.flushes * 1000 if self.flushes else 0.0,
+        }
+
+    def _flush(self, batch: List[tuple]) -> bool:
+        # False when the batch should be retried
+        start = time.perf_counter()
+        done = True
+        try:
+            self.flush_fn(batch)
+            self.flushed_rows += len(batch)
+        except Exception as e:
+            if self.retry_on(e):
+                print(f"Write-behind flush error ({len(batch)} rows held for retry): {e}")
+                done = False
+            else:
+                print(f"Write-behind flush error ({len(batch)} rows dropped): {e}")
+                self.failed_rows += len(batch)
+        elapsed = time.perf_counter() - start
+        self.flushes += 1
+        self.last_flush_seconds = elapsed
+        self.total_flush_seconds += elapsed
+        return done
+
+    def _retry_held(self) -> None:
+        self.retried_flushes += 1
+        if self._flush(self._held):
+            self._held = None
+            self._backoff = self.retry_backoff
+        else:
+            self._stop.wait(self._backoff)
+            self._backoff = min(self._backoff * 2, self.max_retry_backoff)
+
+    def _flush_final(self, batch: List[tuple]) -> None:
+        for attempt in range(STOP_RETRIES + 1):
+            if self._flush(batch):
+                return
+            if attempt < STOP_RETRIES:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        print(f"Write-behind stopped with {len(batch)} unwritten rows")
+        self.failed_rows += len(batch)
+
+    def _drain_remaining(self) -> None:
+        if self._held is not None:
+            held, self._held = self._held, None
+            self._flush_final(held)
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._flush_final(batch)
+                batch = []
+        if batch:
+            self._flush_final(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Oldest rows first: nothing newer is written while a batch is held
+            if self._held is not None:
+                self._retry_held()
+                continue
+
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if not self._flush(batch):
+                self._held = batch
+
+        self._drain_remaining()
@@ -0,0 +1,116 @@
+import argparse
+import csv
+import io
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from database import get_existing_usernames, init_db, insert_users
+from password_pool import hash_many
+
+# Same rules as the self-registration form in auth.register_user()
+MIN_USERNAME_LENGTH = 4
+MAX_USERNAME_LENGTH = 30
+MIN_PASSWORD_LENGTH = 8
+
+def read_roster(f, fmt: str) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[tuple]]:
+    # f: text file object; CSV needs a header with username and password,
+    # JSONL needs one {"username": ..., "password": ...} object per line.
+    # Returns (line number, entry) pairs and, as (line number, username,
+    # reason), the lines that could not be read; lines count from 1 at the
+    # top of the file
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        return [(reader.line_num, dict(row)) for row in reader], []
+    if fmt == "jsonl":
+        entries, unreadable = [], []
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                unreadable.append((line_no, "", f"not valid JSON ({e.msg})"))
+                continue
+            if not isinstance(entry, dict):
+                unreadable.append((line_no, "", "not a JSON object"))
+                continue
+            entries.append((line_no, entry))
+        return entries, unreadable
+    raise ValueError(f"Unknown roster format: {fmt}")
+
+def provision_students(entries: List[Tuple[int, Dict[str, Any]]], rounds: int | None = None,
+                       unreadable: List[tuple] | None = None) -> Dict[str, Any]:
+    # entries and unreadable as returned by read_roster()
+    start = time.perf_counter()
+    invalid = list(unreadable or [])
+    duplicates = []
+    seen = set()
+    accepted = []
+
+    for line_no, entry in entries:
+        username = str(entry.get("username") or "").strip()
+        password = str(entry.get("password") or "")
+        if not MIN_USERNAME_LENGTH <= len(username) <= MAX_USERNAME_LENGTH:
+            invalid.append((line_no, username, f"username must be {MIN_USERNAME_LENGTH}-{MAX_USERNAME_LENGTH} characters"))
+        elif len(password) < MIN_PASSWORD_LENGTH:
+            invalid.append((line_no, username, f"password must be at least {MIN_PASSWORD_LENGTH} characters"))
+        elif username in seen:
+            duplicates.append((line_no, username, "repeated in roster"))
+        else:
+            seen.add(username)
+            accepted.append((line_no, username, password))
+
+    # Skip existing accounts before hashing, which is where the time goes
+    existing = get_existing_usernames([username for _, username, _ in accepted])
+    duplicates += [(line_no, username, "already registered") for line_no, username, _ in accepted if username in existing]
+    accepted = [row for row in accepted if row[1] not in existing]
+
+    hash_start = time.perf_counter()
+    hashes = hash_many([password for _, _, password in accepted], rounds) if accepted else []
+    hash_seconds = time.perf_counter() - hash_start
+
+    created = insert_users([(username, hashed, "user") for (_, username, _), hashed in zip(accepted, hashes)])
+    seconds = time.perf_counter() - start
+
+    return {
+        "created": created,
+        # Anyone registering between the existence check and the insert
+        "skipped_at_insert": len(accepted) - created,
+        "duplicates": duplicates,
+        "invalid": invalid,
+        "seconds": seconds,
+        "hash_seconds": hash_seconds,
+        "accounts_per_second": created / seconds if seconds > 0 else 0.0,
+    }
+
+def provision_file(f, fmt: str, rounds: int | None = None) -> Dict[str, Any]:
+    if isinstance(f, (bytes, bytearray)):
+        f = io.StringIO(f.decode("utf-8-sig"))
+    entries, unreadable = read_roster(f, fmt)
+    return provision_students(entries, rounds, unreadable)
+
+def main():
+    parser = argparse.ArgumentParser(description="Create student accounts in bulk from a roster file")
+    parser.add_argument("roster", help="CSV with username,password columns or JSONL with the same keys")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                        help="Defaults to the file extension")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost (default: BCRYPT_ROUNDS)")
+    args = parser.parse_args()
+
+    fmt = args.format or args.roster.rsplit(".", 1)[-1].lower()
+    init_db()
+    with open(args.roster, newline="", encoding="utf-8-sig") as f:
+        report = provision_file(f, fmt, args.rounds)
+
+    for line_no, username, reason in sorted(report["invalid"] + report["duplicates"]):
+        print(f"  line {line_no}: skipped {username!r} ({reason})")
+    print(
+        f"Created {report['created']:,} accounts in {report['seconds']:.1f}s "
+        f"({report['accounts_per_second']:,.1f}/s, hashing {report['hash_seconds']:.1f}s); "
+        f"{len(report['duplicates']) + report['skipped_at_insert']:,} duplicates, "
+        f"{len(report['invalid']):,} invalid"
+    )
+
+if __name__ == "__main__":
+    main()
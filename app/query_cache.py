@@ -0,0 +1,52 @@
+import threading
+from typing import Any, Callable, Dict
+
+from cachetools import TTLCache
+
+from database import get_data_version
+
+# ── Version-keyed read cache ─────────────────────────────────────────────────
+# Dashboard reads are cached under a key that includes the current data
+# version (see database.get_data_version), so a Streamlit rerun that changes
+# no data reuses the previous result, and a new prediction is visible on the
+# very next rerun without explicit invalidation. Entries are evicted LRU when
+# the cache is full and expire after CACHE_TTL_SECONDS as a backstop.
+# Cached values are shared across sessions and must be treated as read-only.
+CACHE_MAXSIZE = 256
+CACHE_TTL_SECONDS = 300
+
+_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+def cached(name: str, compute: Callable[..., Any], *args, user_id: int | None = None) -> Any:
+    # user_id keys the entry on that student's rows only (see
+    # database.get_data_version); None uses the global version
+    key = (name, args, user_id, get_data_version(user_id))
+
+    with _lock:
+        try:
+            value = _cache[key]
+            _stats["hits"] += 1
+            return value
+        except KeyError:
+            _stats["misses"] += 1
+
+    value = compute(*args)
+    with _lock:
+        _cache[key] = value
+    return value
+
+def cache_stats() -> Dict[str, Any]:
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": len(_cache),
+        }
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
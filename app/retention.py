@@ -0,0 +1,306 @@
+import argparse
+import os
+import sqlite3
+from datetime import date
+from typing import Any, Dict
+
+import database
+from database import (
+    PRAGMAS, PREDICTION_TABLE_COLUMNS, archive_path, attached_archive, bump_data_version,
+    ensure_schema, get_connection, retry_on_locked,
+)
+
+# ── Retention ────────────────────────────────────────────────────────────────
+# Keeps the hot predictions table small enough to stay in the page cache.
+# One maintenance run:
+#   1. compact  collapses each run of consecutive identical submissions by a
+#               student into its latest row, with repeat_count set to the
+#               number of submissions it stands for
+#   2. archive  moves rows from before the retention window into monthly
+#               tables (predictions_YYYY_MM) in the archive database file
+#   3. vacuum   returns freed pages to the filesystem (incremental_vacuum),
+#               refreshes planner statistics and truncates the WAL
+# Rollups, cohort histograms and drift moments are untouched: they were
+# counted when each row was inserted, and rebuild_rollups() reads the archive
+# and weights by repeat_count, so both give the same totals afterwards.
+#
+# Run it from cron or by hand; --dry-run only reports what would change.
+# SQLite cannot commit across attached databases atomically in WAL mode, so
+# each month is copied into the archive and committed first, and only rows
+# the archive now holds are then deleted from the hot table in a second
+# transaction. A run stopped in between leaves rows in both files, which
+# archive-aware reads skip (see database._prediction_source); the next run
+# re-inserts with OR IGNORE and finishes the delete.
+RETENTION_MONTHS = int(os.environ.get("RETENTION_MONTHS", "6"))
+ANALYSIS_LIMIT = 1000  # rows sampled per index by ANALYZE
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Two submissions are identical when all of these match
+DUPLICATE_COLUMNS = [
+    "cgpa", "internships", "projects", "workshops", "aptitude_score", "soft_skills",
+    "extracurricular", "placement_training", "ssc_marks", "hsc_marks", "placement_status"
+]
+
+_same_as_previous = " AND ".join(f"{c} IS LAG({c}) OVER w" for c in DUPLICATE_COLUMNS)
+
+# Rows belonging to runs of two or more identical submissions; from_last = 1
+# is the row each run collapses into, run_total its new repeat_count
+DUPLICATE_RUNS_SQL = f"""
+    WITH flagged AS (
+        SELECT id, user_id, predicted_at, repeat_count,
+               CASE WHEN {_same_as_previous} THEN 0 ELSE 1 END AS starts_run
+        FROM predictions
+        WINDOW w AS (PARTITION BY user_id ORDER BY predicted_at, id)
+    ), runs AS (
+        SELECT id, user_id, predicted_at, repeat_count,
+               SUM(starts_run) OVER (PARTITION BY user_id ORDER BY predicted_at, id) AS run
+        FROM flagged
+    ), sized AS (
+        SELECT id,
+               COUNT(*) OVER g AS run_rows,
+               SUM(repeat_count) OVER g AS run_total,
+               ROW_NUMBER() OVER (PARTITION BY user_id, run ORDER BY predicted_at DESC, id DESC) AS from_last
+        FROM runs
+        WINDOW g AS (PARTITION BY user_id, run)
+    )
+    SELECT id, run_total, from_last FROM sized WHERE run_rows > 1
+"""
+
+ARCHIVE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS archive.{table} (
+        id                  INTEGER PRIMARY KEY,
+        user_id             INTEGER NOT NULL,
+        cgpa                REAL NOT NULL,
+        internships         INTEGER NOT NULL,
+        projects            INTEGER NOT NULL,
+        workshops           INTEGER NOT NULL,
+        aptitude_score      INTEGER NOT NULL,
+        soft_skills         REAL NOT NULL,
+        extracurricular     INTEGER NOT NULL,
+        placement_training  INTEGER NOT NULL,
+        ssc_marks           REAL,
+        hsc_marks           REAL,
+        placement_status    INTEGER NOT NULL,
+        predicted_at        DATETIME,
+        repeat_count        INTEGER NOT NULL DEFAULT 1
+    )
+"""
+
+# Same read paths as the hot table's indexes, so archive-aware reads
+# (database.union_select) stay index range scans: a student's history, and
+# the admin browser's newest-first keyset pages
+ARCHIVE_INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS archive.idx_{table}_user ON {table} (user_id, predicted_at)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_{table}_date_id ON {table} (predicted_at, id)",
+]
+
+def retention_cutoff(months: int = RETENTION_MONTHS, today: date | None = None) -> date:
+    # First day of the oldest month kept: with 6 months on 2026-10-18, rows
+    # before 2026-04-01 are archived
+    today = today or date.today()
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+def _file_bytes() -> int:
+    # Database file plus its WAL, which holds recent pages until a checkpoint
+    return sum(os.path.getsize(p) for p in (database.DB_NAME, f"{database.DB_NAME}-wal") if os.path.exists(p))
+
+def _pragma(conn: sqlite3.Connection, name: str) -> int:
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+def _table_bytes(conn: sqlite3.Connection) -> int | None:
+    # predictions and its indexes; None where SQLite is built without dbstat
+    try:
+        row = conn.execute("""
+            SELECT SUM(pgsize) FROM dbstat
+            WHERE name = 'predictions'
+               OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = 'predictions' AND type = 'index')
+        """).fetchone()
+        return row[0] or 0
+    except sqlite3.Error:
+        return None
+
+def _archive_months(conn: sqlite3.Connection, cutoff: date) -> Dict[str, int]:
+    cursor = conn.execute("""
+        SELECT strftime('%Y_%m', predicted_at) AS month, COUNT(*)
+        FROM predictions
+        WHERE predicted_at < ?
+        GROUP BY month
+        ORDER BY month
+    """, (cutoff.isoformat(),))
+    return {month: n for month, n in cursor.fetchall()}
+
+def plan(months: int = RETENTION_MONTHS) -> Dict[str, Any]:
+    # What a maintenance run would do, without changing anything
+    cutoff = retention_cutoff(months)
+    with get_connection() as conn:
+        hot_rows = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        hot_bytes = _table_bytes(conn)
+        duplicate_rows, duplicate_runs = conn.execute(f"""
+            SELECT COALESCE(SUM(from_last > 1), 0), COALESCE(SUM(from_last = 1), 0)
+            FROM ({DUPLICATE_RUNS_SQL})
+        """).fetchone()
+        archive_months = _archive_months(conn, cutoff)
+        page_size = _pragma(conn, "page_size")
+        freelist_bytes = _pragma(conn, "freelist_count") * page_size
+        auto_vacuum = _pragma(conn, "auto_vacuum")
+
+    # Duplicates before the cutoff appear in both counts (compaction runs
+    # first), hence the cap; bytes assume the table's average row size
+    archive_rows = sum(archive_months.values())
+    removed = min(duplicate_rows + archive_rows, hot_rows)
+    row_bytes = hot_bytes / hot_rows if hot_bytes and hot_rows else 0
+    return {
+        "cutoff": cutoff.isoformat(),
+        "hot_rows": hot_rows,
+        "hot_bytes": hot_bytes,
+        "duplicate_rows": duplicate_rows,
+        "duplicate_runs": duplicate_runs,
+        "archive_months": archive_months,
+        "archive_rows": archive_rows,
+        "freelist_bytes": freelist_bytes,
+        "incremental_vacuum": auto_vacuum == AUTO_VACUUM_INCREMENTAL,
+        "estimated_reclaim_bytes": int(removed * row_bytes) + freelist_bytes,
+        "page_cache_bytes": -PRAGMAS["cache_size"] * 1024,
+    }
+
+@retry_on_locked
+def compact() -> int:
+    # Returns the number of rows removed
+    with get_connection() as conn:
+        conn.execute("DROP TABLE IF EXISTS temp.duplicate_runs")
+        conn.execute(f"CREATE TEMP TABLE duplicate_runs AS {DUPLICATE_RUNS_SQL}")
+        try:
+            conn.execute("""
+                UPDATE predictions
+                SET repeat_count = (SELECT run_total FROM temp.duplicate_runs r WHERE r.id = predictions.id)
+                WHERE id IN (SELECT id FROM temp.duplicate_runs WHERE from_last = 1)
+            """)
+            removed = conn.execute(
+                "DELETE FROM predictions WHERE id IN (SELECT id FROM temp.duplicate_runs WHERE from_last > 1)"
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.duplicate_runs")
+    return removed
+
+def _next_month(month_start: date) -> date:
+    year, month = divmod(month_start.year * 12 + month_start.month, 12)
+    return date(year, month + 1, 1)
+
+@retry_on_locked
+def archive(months: int = RETENTION_MONTHS) -> Dict[str, int]:
+    # Returns rows moved per archive table; two transactions per month
+    cutoff = retention_cutoff(months)
+    columns = ", ".join(PREDICTION_TABLE_COLUMNS)
+    moved = {}
+    with get_connection() as conn:
+        pending = _archive_months(conn, cutoff)
+        with attached_archive(conn, create=bool(pending)) as attached:
+            if not attached:
+                return moved
+            # Tables archived before an index was added get it here
+            existing = conn.execute(
+                "SELECT name FROM archive.sqlite_master WHERE type = 'table' AND name LIKE 'predictions_%'"
+            ).fetchall()
+            for (table,) in existing:
+                for sql in ARCHIVE_INDEX_SQL:
+                    conn.execute(sql.format(table=table))
+            conn.commit()
+
+            for month in pending:
+                table = f"predictions_{month}"
+                start = date(int(month[:4]), int(month[5:]), 1)
+                bounds = (start.isoformat(), min(_next_month(start), cutoff).isoformat())
+
+                conn.execute(ARCHIVE_TABLE_SQL.format(table=table))
+                for sql in ARCHIVE_INDEX_SQL:
+                    conn.execute(sql.format(table=table))
+                conn.execute(f"""
+                    INSERT OR IGNORE INTO archive.{table} ({columns})
+                    SELECT {columns} FROM main.predictions
+                    WHERE predicted_at >= ? AND predicted_at < ?
+                """, bounds)
+                conn.commit()
+
+                moved[table] = conn.execute(f"""
+                    DELETE FROM main.predictions
+                    WHERE predicted_at >= ? AND predicted_at < ?
+                      AND id IN (SELECT id FROM archive.{table})
+                """, bounds).rowcount
+                conn.commit()
+    return moved
+
+def vacuum(full: bool = False) -> Dict[str, Any]:
+    # incremental_vacuum needs auto_vacuum=INCREMENTAL, which an existing
+    # file only picks up through one full VACUUM (full=True)
+    with get_connection() as conn:
+        before = _pragma(conn, "freelist_count") * _pragma(conn, "page_size")
+        switched = False
+        if _pragma(conn, "auto_vacuum") != AUTO_VACUUM_INCREMENTAL:
+            if full:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+                switched = True
+        else:
+            # Frees one page per step; executescript steps it to completion
+            conn.executescript("PRAGMA incremental_vacuum")
+
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        after = _pragma(conn, "freelist_count") * _pragma(conn, "page_size")
+    return {"freed_bytes": before - after, "switched_to_incremental": switched}
+
+def run(months: int = RETENTION_MONTHS, do_compact: bool = True, do_archive: bool = True,
+        do_vacuum: bool = True, full_vacuum: bool = False) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"file_bytes_before": _file_bytes()}
+    if do_compact:
+        result["collapsed_rows"] = compact()
+    if do_archive:
+        result["archived"] = archive(months)
+    if do_vacuum:
+        result.update(vacuum(full_vacuum))
+    result["file_bytes_after"] = _file_bytes()
+    # Stored, so the app's caches see the collapsed and archived rows
+    bump_data_version(persist=True)
+    return result
+
+def _mib(n: int | None) -> str:
+    return "unknown" if n is None else f"{n / 2**20:,.2f} MiB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact, archive and vacuum the predictions table")
+    parser.add_argument("--months", type=int, default=RETENTION_MONTHS,
+                        help="Whole months kept in the hot table besides the current one")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change and exit")
+    parser.add_argument("--no-compact", action="store_true")
+    parser.add_argument("--no-archive", action="store_true")
+    parser.add_argument("--no-vacuum", action="store_true")
+    parser.add_argument("--full-vacuum", action="store_true",
+                        help="Run one full VACUUM if the file is not yet in incremental auto-vacuum mode")
+    args = parser.parse_args()
+
+    ensure_schema()
+    report = plan(args.months)
+    print(f"Hot table: {report['hot_rows']:,} rows, {_mib(report['hot_bytes'])} "
+          f"(page cache {_mib(report['page_cache_bytes'])})")
+    print(f"Duplicates: {report['duplicate_rows']:,} rows in {report['duplicate_runs']:,} runs")
+    print(f"Before {report['cutoff']}: {report['archive_rows']:,} rows -> {archive_path()}")
+    for month, n in report["archive_months"].items():
+        print(f"  predictions_{month}: {n:,} rows")
+    print(f"Free pages: {_mib(report['freelist_bytes'])}; estimated reclaim {_mib(report['estimated_reclaim_bytes'])}")
+    if not report["incremental_vacuum"]:
+        print("Note: auto_vacuum is not INCREMENTAL; pass --full-vacuum once to switch")
+    if args.dry_run:
+        return
+
+    result = run(args.months, not args.no_compact, not args.no_archive, not args.no_vacuum, args.full_vacuum)
+    print(f"Collapsed {result.get('collapsed_rows', 0):,} rows, "
+          f"archived {sum(result.get('archived', {}).values()):,} rows, "
+          f"freed {_mib(result.get('freed_bytes', 0))}")
+    print(f"File size: {_mib(result['file_bytes_before'])} -> {_mib(result['file_bytes_after'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import List, Tuple
+
+from inference import FEATURE_ORDER
+
+# ── Scoring service client ───────────────────────────────────────────────────
+# When SCORING_SERVICE_URL is set, predictions are sent to the local scoring
+# service (scoring_service.py). Any failure returns None so the caller scores
+# in-process instead, and the service is not tried again for
+# RETRY_AFTER_SECONDS, so a stopped service costs one timeout, not one per
+# prediction.
+SCORING_SERVICE_URL = os.environ.get("SCORING_SERVICE_URL", "").rstrip("/")
+REQUEST_TIMEOUT_SECONDS = 2.0
+RETRY_AFTER_SECONDS = 30.0
+
+_down_until = 0.0
+_lock = threading.Lock()
+
+def service_enabled() -> bool:
+    return bool(SCORING_SERVICE_URL) and time.monotonic() >= _down_until
+
+def remote_predict_many(vectors: List[Tuple[float, ...]]) -> List[Tuple[int, float, str | None]] | None:
+    global _down_until
+    if not service_enabled():
+        return None
+
+    body = json.dumps({"rows": [dict(zip(FEATURE_ORDER, v)) for v in vectors]}).encode("utf-8")
+    request = urllib.request.Request(
+        f"{SCORING_SERVICE_URL}/predict", data=body, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+            results = json.loads(response.read())["results"]
+    except (urllib.error.URLError, OSError, ValueError, KeyError):
+        with _lock:
+            _down_until = time.monotonic() + RETRY_AFTER_SECONDS
+        return None
+    return [(r["placed"], r["probability"], r["tier"]) for r in results]
+
+def remote_predict(vector: Tuple[float, ...]) -> Tuple[int, float, str | None] | None:
+    results = remote_predict_many([vector])
+    return results[0] if results else None
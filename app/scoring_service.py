@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from inference import FEATURE_ORDER
+from model_registry import get_placement_scorer, get_tier_predictor
+
+# ── Local scoring service ────────────────────────────────────────────────────
+# Owns the placement scorer and tier predictor so UI processes do not have to.
+# Each HTTP request thread hands its rows to the MicroBatcher and waits; the
+# batcher thread takes whatever arrives within BATCH_WINDOW_SECONDS of the
+# first queued row (up to MAX_BATCH_ROWS), scores it with one score_batch and
+# one tier call, and resolves each request's future with its own slice.
+#
+#   POST /predict  {"rows": [{feature: value, ...}, ...]}
+#                  -> {"results": [{"placed": 0|1, "probability": p, "tier": t|null}, ...]}
+#   GET  /health   -> batching stats
+#
+# Run with `python app/scoring_service.py` and point the app at it with
+# SCORING_SERVICE_URL=http://127.0.0.1:8765 (see scoring_client.py).
+SERVICE_HOST = os.environ.get("SCORING_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("SCORING_SERVICE_PORT", "8765"))
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_ROWS = 1024
+
+def score_matrix(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[str | None]]:
+    # X: 2-D array with columns in FEATURE_ORDER -> (labels, probabilities, tiers)
+    prob, labels = get_placement_scorer().score_batch(X)
+    tiers: List[str | None] = [None] * len(X)
+    placed = np.flatnonzero(labels == 1)
+    if len(placed):
+        for i, tier in zip(placed, get_tier_predictor().predict_labels(X[placed])):
+            tiers[i] = str(tier)
+    return labels, prob, tiers
+
+class MicroBatcher:
+    def __init__(self, window: float = BATCH_WINDOW_SECONDS, max_rows: int = MAX_BATCH_ROWS):
+        self.window = window
+        self.max_rows = max_rows
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._stats = {"requests": 0, "rows": 0, "batches": 0, "max_batch_rows": 0}
+        self._stats_lock = threading.Lock()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, X: np.ndarray) -> Future:
+        future: Future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["rows_per_batch"] = stats["rows"] / stats["batches"] if stats["batches"] else 0.0
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future]]:
+        pending = [self._queue.get()]
+        rows = len(pending[0][0])
+        deadline = time.monotonic() + self.window
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending.append(item)
+            rows += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            X = np.vstack([x for x, _ in pending])
+            try:
+                labels, prob, tiers = score_matrix(X)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for x, future in pending:
+                end = start + len(x)
+                future.set_result([
+                    {"placed": int(labels[i]), "probability": float(prob[i]), "tier": tiers[i]}
+                    for i in range(start, end)
+                ])
+                start = end
+
+            with self._stats_lock:
+                self._stats["requests"] += len(pending)
+                self._stats["rows"] += len(X)
+                self._stats["batches"] += 1
+                self._stats["max_batch_rows"] = max(self._stats["max_batch_rows"], len(X))
+
+def parse_rows(payload: Dict[str, Any]) -> np.ndarray:
+    rows = payload.get("rows")
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("Expected a non-empty 'rows' list")
+    try:
+        return np.array([[float(row[col]) for col in FEATURE_ORDER] for row in rows], dtype=np.float64)
+    except KeyError as e:
+        raise ValueError(f"Missing feature: {e.args[0]}") from None
+    except (TypeError, ValueError):
+        raise ValueError("Feature values must be numeric (Yes/No mapped to 1/0)") from None
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    batcher: MicroBatcher
+    timeout_seconds = 10.0
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send(404, {"error": "Not found"})
+            return
+        self._send(200, {"status": "ok", **self.batcher.stats()})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            X = parse_rows(json.loads(self.rfile.read(length)))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        try:
+            results = self.batcher.submit(X).result(timeout=self.timeout_seconds)
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, {"results": results})
+
+    def log_message(self, format, *args):
+        # Request lines would dominate the output under load
+        pass
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 refuses connections during a burst of predictions
+    request_queue_size = 256
+
+def make_server(host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                window: float = BATCH_WINDOW_SECONDS, max_rows: int = MAX_BATCH_ROWS) -> ScoringServer:
+    # Models are loaded up front so the first request does not pay for it
+    get_placement_scorer()
+    get_tier_predictor()
+
+    batcher = MicroBatcher(window, max_rows)
+    batcher.start()
+    handler = type("BoundScoringHandler", (ScoringHandler,), {"batcher": batcher})
+    return ScoringServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching scoring service for the placement and tier models")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW_SECONDS * 1000,
+                        help="How long to wait for more requests after the first one in a batch")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_ROWS)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.window_ms / 1000, args.max_batch)
+    print(f"Scoring service on http://{args.host}:{server.server_port} "
+          f"(window {args.window_ms:g} ms, max batch {args.max_batch})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
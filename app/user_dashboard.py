@@ -1,25 +1,13 @@
 import streamlit as st
 import pandas as pd
-import pickle
 from datetime import datetime
-from database import insert_prediction, get_user_predictions
+from database import PREDICTION_QUEUED, insert_prediction, get_user_predictions
 from career_recomm import recommend_career
-
-# ── Model loading ────────────────────────────────────────────────────────────
-@st.cache_resource(show_spinner="Loading ML models...")
-def load_models():
-    try:
-        placement = pickle.load(open("models/placement_status_model.pkl", "rb"))
-        tier_model = pickle.load(open("models/company_tier_model.pkl", "rb"))
-        tier_encoder = pickle.load(open("models/company_tier_encoder.pkl", "rb"))
-        return placement, tier_model, tier_encoder
-    except Exception as e:
-        st.error(f"Failed to load models: {str(e)}")
-        st.stop()
-
-placement_model, tier_model, tier_encoder = load_models()
-
-binary_map = {"Yes": 1, "No": 0}
+from cohort_stats import standing
+from inference import binary_map
+from prediction_cache import predict
+from query_cache import cached
+from what_if import explore
 
 # Example companies per tier (customize as needed)
 COMPANY_EXAMPLES = {
@@ -29,6 +17,34 @@ COMPANY_EXAMPLES = {
     "Tier 4": ["Mid-size IT firms", "Startups", "Local companies"]
 }
 
+def history_frame(user_id: int) -> pd.DataFrame | None:
+    # Archived months too; each archive table is indexed by student like the
+    # hot table (see database.union_select)
+    history = get_user_predictions(user_id, include_archive=True)
+    if not history:
+        return None
+
+    df_hist = pd.DataFrame(history)
+
+    df_hist = df_hist.rename(columns={
+        "cgpa": "CGPA",
+        "internships": "Internships",
+        "projects": "Projects",
+        "aptitude_score": "Aptitude Score",
+        "soft_skills": "Soft Skills",
+        "placement_status": "Placed",
+        "predicted_at": "Date",
+        "repeat_count": "Times"
+    })
+
+    desired = ["CGPA", "Internships", "Projects", "Aptitude Score", "Soft Skills", "Placed", "Times", "Date"]
+    available = [col for col in desired if col in df_hist.columns]
+
+    if "Placed" in df_hist.columns:
+        df_hist["Placed"] = df_hist["Placed"].map({1: "Yes ✅", 0: "No"})
+
+    return df_hist[available].sort_values("Date", ascending=False)
+
 def user_dashboard():
     st.title("🎓 Placement & Career Guidance")
 
@@ -80,24 +96,15 @@ def user_dashboard():
                     "HSC_Marks": hsc
                 }
 
-                df = pd.DataFrame([input_data])
-                expected_order = [
-                    "CGPA", "Internships", "Projects", "Workshops/Certifications",
-                    "AptitudeTestScore", "SoftSkillsRating", "ExtracurricularActivities",
-                    "PlacementTraining", "SSC_Marks", "HSC_Marks"
-                ]
-                df = df[expected_order]
-
-                # Prediction
-                prob = placement_model.predict_proba(df)[0][1] if hasattr(placement_model, "predict_proba") else None
-                placed = int(placement_model.predict(df)[0])
+                # Prediction (memoized across sessions; a hit skips both models)
+                try:
+                    placed, prob, tier = predict(input_data)
+                except Exception as e:
+                    st.error(f"Failed to load models: {str(e)}")
+                    st.stop()
 
                 if placed == 1:
-                    prob_display = f"{prob:.1%}" if prob is not None else "strong"
-                    st.success(f"🎉 High placement probability ({prob_display})")
-
-                    tier_code = tier_model.predict(df)[0]
-                    tier = tier_encoder.inverse_transform([tier_code])[0]
+                    st.success(f"🎉 High placement probability ({prob:.1%})")
                     st.markdown(f"**Expected Company Tier**: **{tier}** 🏢")
 
                     # Show example companies
@@ -110,17 +117,49 @@ def user_dashboard():
                     st.warning("⚠️ Lower placement probability at this stage")
 
                 # Save
-                success = insert_prediction(
+                saved = insert_prediction(
                     st.session_state.user_id,
                     cgpa, internships, projects, workshops, aptitude,
                     soft_skills, binary_map[extracurricular], binary_map[training],
                     ssc, hsc, placed
                 )
-                if success:
+                if saved == PREDICTION_QUEUED:
+                    # Written by the background writer; may take a moment to show in history
+                    st.caption(f"Prediction queued for saving • {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+                elif saved:
                     st.caption(f"Prediction saved • {datetime.now().strftime('%Y-%m-%d %H:%M')}")
                 else:
                     st.error("Failed to save prediction")
 
+                # Percentile ranks from the precomputed cohort histograms
+                with st.expander("📍 Where do I stand?", expanded=True):
+                    ranks = standing(input_data, tier if placed == 1 else None)
+                    percent = st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)
+                    st.dataframe(
+                        ranks,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={col: percent for col in ranks.columns if col.startswith("vs ")}
+                    )
+                    st.caption("Percentile ranks: the share of each group at or below your value (ties counted half).")
+
+                # What-if: the whole grid in one batched call, nothing saved
+                with st.expander("🔍 What would improve my chances?", expanded=placed != 1):
+                    _, improvements = explore(input_data)
+                    if improvements.empty:
+                        st.info("No single change (or pair of changes) raises your placement probability further.")
+                    else:
+                        st.dataframe(
+                            improvements,
+                            use_container_width=True,
+                            hide_index=True,
+                            column_config={
+                                "Placement Probability": st.column_config.ProgressColumn(
+                                    "Placement Probability", format="%.2f", min_value=0.0, max_value=1.0),
+                                "Gain": st.column_config.NumberColumn("Gain", format="+%.3f"),
+                            }
+                        )
+
     # ── Career Recommendation Tab ────────────────────────────────────────────
     with tab_career:
         st.subheader("Career Path Recommendations")
@@ -132,7 +171,7 @@ def user_dashboard():
                                ["Technology", "Data & Analytics", "Management", 
                                 "Finance", "Marketing", "Design", "Research"])
 
-        skills = st.text_area("Your skills (comma separated)", 
+        skills = st.text_area("Your skills (comma separated or free text)", 
                              placeholder="Python, SQL, React, Communication, Figma, Power BI",
                              height=100)
 
@@ -154,31 +193,14 @@ def user_dashboard():
     with tab_history:
         st.subheader("Your Previous Predictions")
 
-        history = get_user_predictions(st.session_state.user_id)
+        df_hist = cached("user_history_frame", history_frame, st.session_state.user_id,
+                         user_id=st.session_state.user_id)
 
-        if not history:
+        if df_hist is None:
             st.info("You haven't made any predictions yet.")
         else:
-            df_hist = pd.DataFrame(history)
-
-            df_hist = df_hist.rename(columns={
-                "cgpa": "CGPA",
-                "internships": "Internships",
-                "projects": "Projects",
-                "aptitude_score": "Aptitude Score",
-                "soft_skills": "Soft Skills",
-                "placement_status": "Placed",
-                "predicted_at": "Date"
-            })
-
-            desired = ["CGPA", "Internships", "Projects", "Aptitude Score", "Soft Skills", "Placed", "Date"]
-            available = [col for col in desired if col in df_hist.columns]
-
-            if "Placed" in df_hist.columns:
-                df_hist["Placed"] = df_hist["Placed"].map({1: "Yes ✅", 0: "No"})
-
             st.dataframe(
-                df_hist[available].sort_values("Date", ascending=False),
+                df_hist,
                 use_container_width=True,
                 hide_index=True,
                 column_config={
@@ -0,0 +1,84 @@
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from inference import FEATURE_ORDER
+from metrics import timed
+from model_registry import get_placement_scorer, get_tier_predictor
+
+# ── What-if explorer ─────────────────────────────────────────────────────────
+# Things a student can still change, as (feature, description, steps, upper
+# bound). SSC/HSC marks are history, so they are left alone. Every single step
+# is tried, plus every pair of first steps across two different features; the
+# whole grid is scored with one placement call and one tier call, and nothing
+# is written to the database.
+IMPROVEMENTS: List[Tuple[str, str, List[float], float]] = [
+    ("CGPA",                      "+{step:g} CGPA",                     [0.25, 0.5, 1.0], 10.0),
+    ("Internships",               "+{step:g} internship{s}",            [1, 2],           10),
+    ("Projects",                  "+{step:g} project{s}",               [1, 2],           15),
+    ("Workshops/Certifications",  "+{step:g} certification{s}",         [1, 2, 3],        20),
+    ("AptitudeTestScore",         "+{step:g} aptitude score",           [5, 10, 15],      100),
+    ("SoftSkillsRating",          "+{step:g} soft-skills rating",       [0.5, 1.0],       5.0),
+    ("PlacementTraining",         "Attend placement training",          [1],              1),
+    ("ExtracurricularActivities", "Take up extracurricular activities", [1],              1),
+]
+BINARY = {"PlacementTraining", "ExtracurricularActivities"}
+
+def _describe(template: str, step: float) -> str:
+    return template.format(step=step, s="" if step == 1 else "s")
+
+def _apply(profile: Dict[str, float], feature: str, step: float, upper: float) -> Dict[str, float] | None:
+    current = profile[feature]
+    new = 1 if feature in BINARY else min(current + step, upper)
+    if new == current:
+        return None                 # already at the cap / already attended
+    return {**profile, feature: new}
+
+def build_grid(profile: Dict[str, float]) -> Tuple[List[str], np.ndarray]:
+    changes, rows = [], []
+
+    singles = []
+    for feature, label, steps, upper in IMPROVEMENTS:
+        for i, step in enumerate(steps):
+            changed = _apply(profile, feature, step, upper)
+            if changed is None:
+                continue
+            changes.append(_describe(label, step))
+            rows.append(changed)
+            if i == 0:
+                singles.append((feature, label, step, upper))
+
+    for (f1, l1, s1, u1), (f2, l2, s2, u2) in combinations(singles, 2):
+        changed = _apply(_apply(profile, f1, s1, u1), f2, s2, u2)
+        changes.append(f"{_describe(l1, s1)} & {_describe(l2, s2)}")
+        rows.append(changed)
+
+    X = np.array([[row[col] for col in FEATURE_ORDER] for row in rows], dtype=np.float64).reshape(-1, len(FEATURE_ORDER))
+    return changes, X
+
+@timed("inference.what_if")
+def explore(profile: Dict[str, float], top_n: int = 8) -> Tuple[float, pd.DataFrame]:
+    # profile: FEATURE_ORDER -> value with Yes/No already mapped to 1/0.
+    # Returns the baseline probability and the most effective changes.
+    changes, X = build_grid(profile)
+    baseline = np.array([[profile[col] for col in FEATURE_ORDER]], dtype=np.float64)
+
+    prob, placed = get_placement_scorer().score_batch(np.vstack([baseline, X]))
+    base_prob, prob, placed = float(prob[0]), prob[1:], placed[1:]
+
+    tiers = np.full(len(changes), None, dtype=object)
+    if placed.any():
+        tiers[placed == 1] = get_tier_predictor().predict_labels(X[placed == 1])
+
+    df = pd.DataFrame({
+        "Change": changes,
+        "Placement Probability": prob,
+        "Gain": prob - base_prob,
+        "Placed": placed.astype(bool),
+        "Expected Tier": tiers,
+    })
+    # Stable sort so single changes stay ahead of equally effective pairs
+    df = df[df["Gain"] > 0].sort_values("Gain", ascending=False, kind="stable")
+    return base_prob, df.head(top_n).reset_index(drop=True)
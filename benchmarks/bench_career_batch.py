@@ -0,0 +1,39 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+os.chdir(ROOT)
+
+from bench_career_recomm import comparable, random_inputs
+from career_batch import BatchRecommender
+from career_recomm import recommend_career
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch career recommendations: parity and throughput")
+    parser.add_argument("--students", type=int, default=50000)
+    args = parser.parse_args()
+
+    cases = list(random_inputs(args.students))
+    courses, skills, interests = (list(col) for col in zip(*cases))
+    recommender = BatchRecommender()
+
+    start = time.perf_counter()
+    batch = recommender.recommend(courses, skills, interests)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [recommend_career(c, s, i) for c, s, i in cases]
+    single_seconds = time.perf_counter() - start
+
+    for case, expected, actual in zip(cases, single, batch):
+        assert comparable(actual) == comparable(expected), f"Mismatch for {case!r}"
+    print(f"Parity OK on {len(cases):,} students")
+    print(f"per student {single_seconds:6.2f}s ({len(cases) / single_seconds:10,.0f} students/s)")
+    print(f"batch       {batch_seconds:6.2f}s ({len(cases) / batch_seconds:10,.0f} students/s)")
+
+if __name__ == "__main__":
+    main()
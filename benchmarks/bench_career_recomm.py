@@ -0,0 +1,140 @@
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+os.chdir(ROOT)
+
+from career_recomm import recommend_career, skill_index
+
+COURSES = ["BTech", "BCA", "MCA", "MBA", "BSc", "BCom", "Other"]
+INTERESTS = ["Technology", "Data & Analytics", "Management", "Finance", "Marketing", "Design", "Research"]
+
+def reference_recommend_career(course: str, skills_input: str, interest: str) -> list[dict]:
+    # The original hard-coded implementation (title if/elif chain folded into a
+    # dict), kept as the parity oracle
+    skills = [s.strip().lower() for s in skills_input.split(",") if s.strip()]
+
+    skill_groups = {
+        "programming": ["python", "java", "c++", "javascript", "c#", "go", "dsa"],
+        "web":         ["html", "css", "javascript", "react", "node", "django", "next.js"],
+        "data":        ["sql", "excel", "power bi", "tableau", "pandas", "statistics"],
+        "ai_ml":       ["machine learning", "ai", "ml", "deep learning", "tensorflow"],
+        "cloud":       ["aws", "azure", "gcp", "devops", "docker", "kubernetes"],
+        "marketing":   ["seo", "digital marketing", "content", "social media", "google ads"],
+        "design":      ["figma", "ui", "ux", "adobe", "graphic design"],
+        "finance":     ["finance", "accounting", "financial modeling", "excel advanced"],
+        "management":  ["project management", "agile", "business analysis", "leadership"]
+    }
+
+    course_boost = {
+        "BTech":  ["programming", "web", "ai_ml", "cloud", "data"],
+        "BCA":    ["programming", "web", "data", "ai_ml"],
+        "MCA":    ["programming", "ai_ml", "cloud", "data"],
+        "MBA":    ["management", "finance", "marketing"],
+        "BCom":   ["finance", "management", "marketing"],
+        "BSc":    ["data", "ai_ml", "programming"]
+    }
+
+    interest_map = {
+        "Technology":       ["Software Engineer", "Full-Stack Developer"],
+        "Data & Analytics": ["Data Analyst", "Data Scientist"],
+        "Management":       ["Business Analyst", "Product Manager"],
+        "Finance":          ["Financial Analyst"],
+        "Marketing":        ["Digital Marketer"],
+        "Design":           ["UI/UX Designer"],
+        "Research":         ["Research Analyst", "Data Scientist"]
+    }
+
+    titles = {
+        "programming": "Software Engineer", "web": "Full-Stack / Web Developer",
+        "data": "Data Analyst", "ai_ml": "AI / ML Engineer", "cloud": "Cloud / DevOps Engineer",
+        "marketing": "Digital Marketer", "design": "UI/UX Designer",
+        "finance": "Financial Analyst", "management": "Business Analyst"
+    }
+
+    recs = {}
+    for group, keywords in skill_groups.items():
+        matches = sum(1 for k in keywords if k in skills)
+        if matches > 0:
+            score = matches / len(keywords) * 60
+            title = titles[group]
+            recs[title] = recs.get(title, {"score": 0, "reasons": []})
+            recs[title]["score"] += score
+            recs[title]["reasons"].append(f"{group.replace('_', ' ').title()} skills ({matches} match)")
+
+    for role in interest_map.get(interest, []):
+        recs[role] = recs.get(role, {"score": 0, "reasons": []})
+        recs[role]["score"] += 70
+        recs[role]["reasons"].append(f"Aligns with your interest: {interest}")
+
+    for group in course_boost.get(course, []):
+        for title, data in list(recs.items()):
+            if any(g in title.lower() for g in ["engineer", "developer", "analyst", "scientist"]):
+                data["score"] += 25
+                data["reasons"].append(f"Strong fit for {course} graduates")
+
+    result = []
+    for title, data in recs.items():
+        result.append({
+            "title": title,
+            "confidence": min(round(data["score"]), 100),
+            "reasons": ", ".join(set(data["reasons"]))
+        })
+    result.sort(key=lambda x: x["confidence"], reverse=True)
+    if not result:
+        result = [{
+            "title": "Explore High-Demand Fields",
+            "confidence": 50,
+            "reasons": "Add more specific skills or consider certifications in Data Analytics, Cloud, AI, Digital Marketing"
+        }]
+    return result[:6]
+
+def comparable(recs):
+    # Reasons are joined from a set, so their order is not stable across runs
+    return [(r["title"], r["confidence"], frozenset(r["reasons"].split(", "))) for r in recs]
+
+def random_inputs(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    keywords = list(skill_index.keyword_groups) + ["communication", "teamwork", "rust"]
+    for _ in range(n):
+        picked = rng.sample(keywords, rng.randint(0, 8))
+        picked = [k.upper() if rng.random() < 0.2 else k for k in picked]
+        yield rng.choice(COURSES), ", ".join(f" {k} " if rng.random() < 0.3 else k for k in picked), rng.choice(INTERESTS)
+
+# Free text the reference cannot read; everyday words must not count as skills
+FREE_TEXT_CASES = [
+    ("Worked with pandas & Power BI dashboards, built REST APIs in nodejs; some k8s",
+     {"pandas", "power bi", "node", "kubernetes"}),
+    ("I want to go into finance", {"finance"}),
+    ("I excel at writing content and react well under pressure", set()),
+    ("Golang microservices, UI design in Figma", {"go", "ui", "figma"}),
+    ("Artificial intelligence research with TensorFlow", {"ai", "tensorflow"}),
+    ("go, AI , ui, content", {"go", "ai", "ui", "content"}),
+    ("Go programming, node backend", set()),
+]
+
+def main():
+    cases = list(random_inputs(20000))
+    for course, skills, interest in cases:
+        expected = comparable(reference_recommend_career(course, skills, interest))
+        actual = comparable(recommend_career(course, skills, interest))
+        assert actual == expected, f"Mismatch for {course!r}, {skills!r}, {interest!r}"
+    print(f"Parity OK on {len(cases):,} comma-separated inputs")
+
+    for text, expected in FREE_TEXT_CASES:
+        actual = skill_index.match_skills(text)
+        assert actual == expected, f"Free text {text!r}: {sorted(actual)} != {sorted(expected)}"
+    print(f"Free text OK on {len(FREE_TEXT_CASES)} sentences")
+
+    for name, fn in [("reference", reference_recommend_career), ("compiled index", recommend_career)]:
+        start = time.perf_counter()
+        for course, skills, interest in cases:
+            fn(course, skills, interest)
+        elapsed = time.perf_counter() - start
+        print(f"{name:15} {elapsed / len(cases) * 1e6:8.1f} us/call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+os.chdir(ROOT)
+
+import pandas as pd
+import pyarrow as pa
+
+import database
+from prediction_export import export_predictions
+from synthetic import fill_database
+
+def measure(fn):
+    pool = pa.default_memory_pool()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, seconds, peak, pool.max_memory()
+
+def naive_csv(path: str) -> int:
+    # What the admin download button used to do
+    df = pd.DataFrame(database.get_all_predictions(limit=-1))
+    data = df.to_csv(index=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(df)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming prediction exports")
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        fill_database(args.rows)
+
+        print(f"{'export':16} {'rows':>10} {'seconds':>8} {'rows/s':>10} {'py peak MiB':>12} {'arrow MiB':>10} {'file MiB':>9}")
+        cases = [
+            ("in-memory csv", "naive.csv", lambda path: naive_csv(path)),
+            ("streaming csv", "out.csv", lambda path: export_predictions(path, "csv")["rows"]),
+            ("parquet", "out.parquet", lambda path: export_predictions(path, "parquet")["rows"]),
+            ("arrow ipc", "out.arrow", lambda path: export_predictions(path, "arrow")["rows"]),
+        ]
+        for name, filename, fn in cases:
+            path = os.path.join(tmp, filename)
+            rows, seconds, peak, arrow_peak = measure(lambda: fn(path))
+            print(f"{name:16} {rows:10,} {seconds:8.2f} {rows / seconds:10,.0f} {peak / 2**20:12.1f} "
+                  f"{arrow_peak / 2**20:10.1f} {os.path.getsize(path) / 2**20:9.1f}")
+
+        database.close_connection()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+os.chdir(ROOT)
+
+import bcrypt
+import numpy as np
+
+import password_pool
+
+PASSWORD = "correct horse battery"
+
+def inline_verify(password: str, hashed: bytes) -> bool:
+    # The old auth.verify_password, run on the calling thread
+    return bcrypt.checkpw(password.encode("utf-8"), hashed)
+
+def login_storm(verify, hashed: bytes, n: int):
+    latencies = [0.0] * n
+    errors = [0]
+    barrier = threading.Barrier(n)
+
+    def one_login(i):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            verify(PASSWORD, hashed)
+        except password_pool.PasswordPoolBusy:
+            errors[0] += 1
+        latencies[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=one_login, args=(i,)) for i in range(n)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, np.array(latencies), errors[0]
+
+def heartbeat_during(fn):
+    # How often another "session" gets to run while the storm is in progress;
+    # a stalled GIL shows up as a high worst-case gap
+    gaps = []
+    done = threading.Event()
+
+    def tick():
+        last = time.perf_counter()
+        while not done.is_set():
+            time.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    t = threading.Thread(target=tick)
+    t.start()
+    result = fn()
+    done.set()
+    t.join()
+    return result, max(gaps) if gaps else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate N concurrent student logins")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=password_pool.BCRYPT_ROUNDS)
+    parser.add_argument("--skip-inline", action="store_true", help="Only run the pooled variant")
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=args.rounds))
+    # Warm the pool so worker start-up is not counted
+    password_pool.verify_password(PASSWORD, hashed)
+
+    variants = [("process pool", password_pool.verify_password)]
+    if not args.skip_inline:
+        variants.insert(0, ("inline (old)", inline_verify))
+
+    print(f"{args.logins} concurrent logins, bcrypt cost {args.rounds}, {password_pool.MAX_WORKERS} workers")
+    print(f"{'variant':14} {'wall s':>8} {'p50 ms':>8} {'p99 ms':>8} {'busy':>5} {'max stall ms':>13}")
+    for name, verify in variants:
+        (wall, latencies, busy), stall = heartbeat_during(lambda: login_storm(verify, hashed, args.logins))
+        print(f"{name:14} {wall:8.2f} {np.percentile(latencies, 50) * 1000:8.0f} "
+              f"{np.percentile(latencies, 99) * 1000:8.0f} {busy:5d} {stall * 1000:13.1f}")
+
+    password_pool.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+os.chdir(ROOT)
+
+import numpy as np
+import pandas as pd
+
+from inference import FEATURE_ORDER, load_models, prepare_features
+from placement_scorer import PlacementScorer
+
+def check_parity(model, scorer, X: pd.DataFrame) -> None:
+    sk_prob = model.predict_proba(X)[:, 1]
+    sk_label = model.predict(X)
+
+    prob, labels = scorer.score_batch(X.to_numpy())
+    assert np.allclose(prob, sk_prob, rtol=0, atol=1e-12), "batch probabilities differ from sklearn"
+    assert (labels == sk_label).all(), "batch labels differ from sklearn"
+
+    for i, row in enumerate(X.to_dict("records")):
+        p, label = scorer.score(row)
+        assert abs(p - sk_prob[i]) <= 1e-12, f"row {i}: probability differs from sklearn"
+        assert label == sk_label[i], f"row {i}: label differs from sklearn"
+
+def time_per_call(fn, rows, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            fn(row)
+        best = min(best, time.perf_counter() - start)
+    return best / len(rows)
+
+def main():
+    placement_model, _, _ = load_models()
+    scorer = PlacementScorer.from_model(placement_model)
+
+    X = prepare_features(pd.read_csv("data/raw/placementdata_with_company_tier.csv"))
+    check_parity(placement_model, scorer, X)
+    print(f"Parity OK on {len(X):,} rows")
+
+    rows = X.head(500).to_dict("records")
+
+    def sklearn_path(row):
+        df = pd.DataFrame([row])[FEATURE_ORDER]
+        placement_model.predict_proba(df)[0][1]
+        int(placement_model.predict(df)[0])
+
+    sk = time_per_call(sklearn_path, rows)
+    fast = time_per_call(scorer.score, rows)
+    print(f"sklearn single row: {sk * 1e6:9.1f} us")
+    print(f"fast scorer:        {fast * 1e6:9.1f} us  ({sk / fast:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+os.chdir(ROOT)
+
+import numpy as np
+import pandas as pd
+
+import scoring_client
+from inference import FEATURE_ORDER, prepare_features
+from scoring_service import make_server, score_matrix
+
+def run(window_ms: float, vectors, clients: int):
+    server = make_server(port=0, window=window_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scoring_client.SCORING_SERVICE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(scoring_client.remote_predict, vectors))
+    seconds = time.perf_counter() - start
+
+    stats = server.RequestHandlerClass.batcher.stats()
+    server.shutdown()
+    server.server_close()
+    return results, seconds, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring service: parity and throughput under concurrent requests")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=32)
+    args = parser.parse_args()
+
+    df = pd.read_csv("data/raw/placementdata_with_company_tier.csv").sample(args.requests, replace=True, random_state=0)
+    X = prepare_features(df)[FEATURE_ORDER].to_numpy(dtype=np.float64)
+    vectors = [tuple(row) for row in X]
+
+    labels, prob, tiers = score_matrix(X)
+    expected = [(int(l), float(p), t) for l, p, t in zip(labels, prob, tiers)]
+
+    for window_ms in [0.0, 2.0, 5.0]:
+        results, seconds, stats = run(window_ms, vectors, args.clients)
+        # Batch composition changes the BLAS path, so probabilities may differ in the last ulp
+        assert [(r[0], r[2]) for r in results] == [(e[0], e[2]) for e in expected], "Labels or tiers differ"
+        assert np.allclose([r[1] for r in results], [e[1] for e in expected], rtol=0, atol=1e-12)
+        print(f"window {window_ms:4.1f} ms: {args.requests / seconds:8,.0f} requests/s, "
+              f"{stats['rows_per_batch']:6.1f} rows/batch over {stats['batches']:,} batches")
+
+if __name__ == "__main__":
+    main()
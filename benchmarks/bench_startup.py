@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each page needs imported before it can render. app.py imports only
+# the login path up front; a dashboard is imported after login, for its role.
+ENTRY_POINTS = {
+    "login page": "import auth",
+    "student dashboard": "import auth, user_dashboard",
+    "admin dashboard": "import auth, admin_dashboard",
+    "everything (old app.py)": "import auth, user_dashboard, admin_dashboard",
+}
+
+def profile(statement: str) -> dict:
+    # Fresh interpreter with -X importtime; the report goes to stderr as
+    # "import time: self [us] | cumulative | imported package"
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "app")}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us), len(name) - len(name.lstrip())))
+    # Top-level imports (least indented) add up to the whole import cost
+    top = min(depth for *_, depth in modules)
+    total_us = sum(cumulative for _, _, cumulative, depth in modules if depth == top)
+    return {
+        "total_ms": total_us / 1000,
+        "modules": len(modules),
+        "slowest": [
+            {"module": name, "self_ms": self_us / 1000}
+            for name, self_us, _, _ in sorted(modules, key=lambda m: -m[1])[:10]
+        ],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of each app entry point")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point (median is reported)")
+    parser.add_argument("--json", help="Write the results to this path")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per entry point")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in ENTRY_POINTS.items():
+        runs = sorted((profile(statement) for _ in range(args.runs)), key=lambda r: r["total_ms"])
+        results[name] = runs[len(runs) // 2]
+
+    print(f"{'entry point':26} {'import ms':>10} {'modules':>8}")
+    for name, r in results.items():
+        print(f"{name:26} {r['total_ms']:10.1f} {r['modules']:8}")
+        for m in r["slowest"][:args.top]:
+            print(f"    {m['module']:40} {m['self_ms']:8.1f} ms self")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
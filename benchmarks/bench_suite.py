@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+os.chdir(ROOT)
+
+import numpy as np
+
+import database
+import password_pool
+from admin_dashboard import to_display_frame
+from career_recomm import recommend_career
+from inference import FEATURE_ORDER
+from model_registry import get_placement_scorer, get_tier_predictor
+from synthetic import SyntheticProfiles, fill_database
+
+# ── Benchmark suite ──────────────────────────────────────────────────────────
+# Times the hot paths against synthetic databases of each --sizes row count
+# and writes the medians as JSON. With --compare, every metric is checked
+# against a stored baseline and the run exits non-zero when one is more than
+# --tolerance slower:
+#
+#   python benchmarks/bench_suite.py --out baseline.json
+#   python benchmarks/bench_suite.py --compare baseline.json
+#
+# The 1M-row database takes a few minutes to fill; pass --sizes 10000 100000
+# for a quick run.
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_TOLERANCE = 0.25
+LOGIN_PASSWORD = "correct horse battery"
+
+def time_calls(fn, samples: int, number: int = 1) -> dict:
+    # Median and p95 of `samples` timings, each averaged over `number` calls
+    fn()
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        "median_ms": float(np.median(times)) * 1000,
+        "p95_ms": float(np.percentile(times, 95)) * 1000,
+        "samples": samples,
+        "number": number,
+    }
+
+def cold_start(statement: str, samples: int = 3) -> dict:
+    # Fresh interpreter per sample, so imports and artifact loads are really cold
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "app")}
+    times = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout)
+        for _ in range(samples)
+    ]
+    return {"median_ms": float(np.median(times)) * 1000, "p95_ms": max(times) * 1000,
+            "samples": samples, "number": 1}
+
+def database_cases(size: int, tmp: str) -> dict:
+    database.DB_NAME = os.path.join(tmp, f"bench_{size}.db")
+    n_users = fill_database(size)
+    rng = random.Random(0)
+    row = SyntheticProfiles(seed=1).prediction_rows(1, n_users)[0]
+    full_samples = 3 if size >= 1_000_000 else 5
+
+    results = {
+        "insert_prediction": time_calls(lambda: database.insert_prediction(*row), samples=200),
+        "get_user_predictions": time_calls(lambda: database.get_user_predictions(rng.randint(1, n_users)), samples=200),
+        "get_all_predictions": time_calls(database.get_all_predictions, samples=50),
+        "get_all_predictions_full": time_calls(lambda: database.get_all_predictions(limit=-1), samples=full_samples),
+        "admin_display_frame": time_calls(lambda: to_display_frame(database.get_all_predictions()), samples=50),
+        "prediction_summary": time_calls(database.get_prediction_summary, samples=200),
+    }
+    database.close_connection()
+    return results
+
+def model_cases(batch_rows: int = 10_000) -> dict:
+    X, _ = SyntheticProfiles(seed=2).sample(batch_rows)
+    profile = dict(zip(FEATURE_ORDER, X[0]))
+    scorer, forest = get_placement_scorer(), get_tier_predictor()
+
+    hashed = password_pool.hash_password(LOGIN_PASSWORD)
+    results = {
+        "recommend_career": time_calls(
+            lambda: recommend_career("BTech", "Python, SQL, React, Power BI, AWS", "Data & Analytics"),
+            samples=50, number=200),
+        "score_single": time_calls(lambda: scorer.score(profile), samples=50, number=200),
+        "tier_single": time_calls(lambda: forest.predict_labels(X[:1]), samples=50, number=50),
+        "score_batch_10k": time_calls(lambda: scorer.score_batch(X), samples=20),
+        "tier_batch_10k": time_calls(lambda: forest.predict_labels(X), samples=10),
+        "load_models_cold": cold_start("import inference; inference.load_models()"),
+        "registry_cold": cold_start(
+            "import model_registry as m; m.get_placement_scorer(); m.get_tier_predictor()"),
+        "bcrypt_login": time_calls(lambda: password_pool.verify_password(LOGIN_PASSWORD, hashed), samples=5),
+    }
+    password_pool.shutdown()
+    return results
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes: list[int]) -> dict:
+    results = {}
+    for name, stats in model_cases().items():
+        results[name] = stats
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for name, stats in database_cases(size, tmp).items():
+                results[f"{name}@{size}"] = stats
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "bcrypt_rounds": password_pool.BCRYPT_ROUNDS,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    # Returns the names of metrics whose median regressed beyond the tolerance
+    regressions = []
+    print(f"{'metric':34} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:34} {'-':>12} {stats['median_ms']:12.3f} {'new':>7}")
+            continue
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            flag = "  improved"
+        print(f"{name:34} {base['median_ms']:12.3f} {stats['median_ms']:12.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+def print_results(report: dict) -> None:
+    print(f"{'metric':34} {'median ms':>12} {'p95 ms':>12}")
+    for name, stats in report["results"].items():
+        print(f"{name:34} {stats['median_ms']:12.3f} {stats['p95_ms']:12.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the key paths on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Prediction row counts to fill the database with (e.g. 10000 100000 1000000)")
+    parser.add_argument("--out", help="Write results as JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a stored results file")
+    parser.add_argument("--current", metavar="RESULTS", help="Compare this results file instead of running the suite")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a metric counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run_suite(args.sizes)
+        print_results(report)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions")
+
+if __name__ == "__main__":
+    main()
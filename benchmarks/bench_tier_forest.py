@@ -0,0 +1,101 @@
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+os.chdir(ROOT)
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from forest_engine import CompactForest, export_forest
+from inference import FEATURE_ORDER, TIER_ENCODER_PATH, TIER_MODEL_PATH
+
+VARIANTS = [
+    ("exact", {}),
+    ("quantized", {"quantize": True}),
+    ("depth 12", {"max_depth": 12}),
+    ("100 trees", {"n_trees": 100}),
+    ("100 trees, depth 12, quantized", {"n_trees": 100, "max_depth": 12, "quantize": True}),
+]
+
+def load_test_split():
+    # Same hold-out split as notebooks/03_company_tier_model.ipynb
+    df = pd.read_csv("data/processed/cleaned_placement_data.csv")
+    placed = df[df["PlacementStatus"] == 1]
+    _, X_test, _, y_test = train_test_split(
+        placed[FEATURE_ORDER], placed["Company_Tier"],
+        test_size=0.2, random_state=42, stratify=placed["Company_Tier"]
+    )
+    return X_test, y_test.to_numpy()
+
+def traced_load(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, elapsed, current, peak
+
+def latency(fn, X, repeat: int = 200):
+    times = []
+    for i in range(repeat):
+        row = X[i % len(X): i % len(X) + 1]
+        start = time.perf_counter()
+        fn(row)
+        times.append(time.perf_counter() - start)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+def batch_time(fn, X, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    with open(TIER_ENCODER_PATH, "rb") as f:
+        encoder = pickle.load(f)
+
+    def load_sklearn():
+        with open(TIER_MODEL_PATH, "rb") as f:
+            return pickle.load(f)
+
+    model, load_s, resident, peak = traced_load(load_sklearn)
+    X_test, y_test = load_test_split()
+    X_np = X_test.to_numpy()
+    sk_labels = encoder.inverse_transform(model.predict(X_test))
+    sk_acc = (sk_labels == y_test).mean()
+
+    print(f"{'variant':34} {'file KiB':>9} {'resident KiB':>13} {'load ms':>8} "
+          f"{'p50 us':>8} {'p99 us':>8} {'batch ms':>9} {'agree':>7} {'acc':>7} {'delta':>7}")
+
+    p50, p99 = latency(model.predict, X_test)
+    print(f"{'sklearn pickle':34} {os.path.getsize(TIER_MODEL_PATH) / 1024:9.0f} {resident / 1024:13.0f} "
+          f"{load_s * 1000:8.1f} {p50 * 1e6:8.0f} {p99 * 1e6:8.0f} "
+          f"{batch_time(model.predict, X_test) * 1000:9.1f} {1.0:7.2%} {sk_acc:7.2%} {0.0:+7.2%}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in VARIANTS:
+            path = os.path.join(tmp, name.replace(" ", "_").replace(",", ""))
+            export_forest(model, encoder, path, **options)
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+            forest, load_s, resident, _ = traced_load(lambda: CompactForest.load(path))
+            labels = forest.predict_labels(X_np)
+            acc = (labels == y_test).mean()
+            p50, p99 = latency(forest.predict_labels, X_np)
+            print(f"{name:34} {size / 1024:9.0f} {resident / 1024:13.0f} {load_s * 1000:8.1f} "
+                  f"{p50 * 1e6:8.0f} {p99 * 1e6:8.0f} {batch_time(forest.predict_labels, X_np) * 1000:9.1f} "
+                  f"{(labels == sk_labels).mean():7.2%} {acc:7.2%} {acc - sk_acc:+7.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import numpy as np
+import pandas as pd
+
+import database
+from inference import FEATURE_ORDER, prepare_features
+
+SOURCE_PATH = os.path.join(ROOT, "data", "raw", "placementdata_with_company_tier.csv")
+
+# Continuous features get a little noise on top of the resampled value, as
+# (standard deviation, decimals); counts and Yes/No flags are resampled as-is
+JITTER = {
+    "CGPA": (0.1, 1),
+    "AptitudeTestScore": (2.0, 0),
+    "SoftSkillsRating": (0.1, 1),
+    "SSC_Marks": (2.0, 0),
+    "HSC_Marks": (2.0, 0),
+}
+
+class SyntheticProfiles:
+    # Bootstraps whole rows of the raw dataset, so feature correlations and the
+    # placement rate carry over, then jitters the continuous columns within
+    # the observed range so large samples are not just repeated rows
+    def __init__(self, path: str = SOURCE_PATH, seed: int = 42):
+        df = pd.read_csv(path)
+        self.X = prepare_features(df).to_numpy(dtype=np.float64)
+        self.placed = (df["PlacementStatus"] == "Placed").to_numpy(dtype=np.int64)
+        self.low = self.X.min(axis=0)
+        self.high = self.X.max(axis=0)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        idx = self.rng.integers(0, len(self.X), size=n)
+        X = self.X[idx].copy()
+        for col, (sd, decimals) in JITTER.items():
+            j = FEATURE_ORDER.index(col)
+            X[:, j] = np.round(np.clip(X[:, j] + self.rng.normal(0, sd, n), self.low[j], self.high[j]), decimals)
+        return X, self.placed[idx]
+
+    def prediction_rows(self, n: int, n_users: int):
+        # Rows in the column order of database.INSERT_PREDICTION_SQL
+        X, placed = self.sample(n)
+        user_ids = self.rng.integers(1, n_users + 1, size=n)
+        columns = [user_ids.tolist()]
+        for j, col in enumerate(FEATURE_ORDER):
+            values = X[:, j]
+            columns.append(values.astype(np.int64).tolist() if col not in JITTER or JITTER[col][1] == 0 else values.tolist())
+        columns.append(placed.tolist())
+        return list(zip(*columns))
+
+def fill_database(n_rows: int, n_users: int | None = None, seed: int = 42, chunk_size: int = 50000) -> int:
+    # Fills database.DB_NAME with synthetic users and predictions; point
+    # DB_NAME at a scratch file first
+    n_users = n_users or max(100, n_rows // 20)
+    database.init_db()
+    database.insert_users([(f"student{i}", b"x", "user") for i in range(n_users)])
+
+    profiles = SyntheticProfiles(seed=seed)
+    for start in range(0, n_rows, chunk_size):
+        database.insert_predictions(profiles.prediction_rows(min(chunk_size, n_rows - start), n_users))
+    return n_users
@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# ── Dataset store ────────────────────────────────────────────────────────────
+# Streams the raw export through the cleaning steps of notebook 01 in chunks
+# and writes the result as Parquet (compressed, for sharing) and Feather
+# (uncompressed Arrow IPC, which load_table() memory-maps without copying).
+# Columns use the smallest dtype that holds them exactly: uint8 counts and
+# scores, int8 0/1 flags, float32 marks (whole numbers), float64 CGPA and
+# soft-skills ratings (decimals such as 8.1 have no exact float32), and a
+# fixed categorical for Company_Tier. A manifest records the raw file's
+# sha256 and the schema, and prepare() does nothing when both still match.
+# Default paths are resolved against the repository root, so importing this
+# module never depends on, or changes, the working directory.
+RAW_PATH = os.path.join(ROOT, "data", "raw", "placementdata_with_company_tier.csv")
+OUTPUT_DIR = os.path.join(ROOT, "data", "processed")
+BASENAME = "cleaned_placement_data"
+CHUNK_ROWS = 100_000
+
+TIER_CATEGORIES = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+YES_NO = {"yes": 1, "no": 0}
+PLACEMENT_STATUS = {"placed": 1, "notplaced": 0, "not placed": 0}
+FLAG_COLUMNS = ["ExtracurricularActivities", "PlacementTraining"]
+
+# Raw columns as read from the CSV; flags and status are cleaned afterwards
+RAW_DTYPES = {
+    "StudentID": "int64",
+    "CGPA": "float64",
+    "Internships": "uint8",
+    "Projects": "uint8",
+    "Workshops/Certifications": "uint8",
+    "AptitudeTestScore": "uint8",
+    "SoftSkillsRating": "float64",
+    "ExtracurricularActivities": "string",
+    "PlacementTraining": "string",
+    "SSC_Marks": "float32",
+    "HSC_Marks": "float32",
+    "PlacementStatus": "string",
+    "Company_Tier": "string",
+}
+
+# Same columns and order as the cleaned CSV produced by notebook 01
+SCHEMA = pa.schema([
+    ("CGPA", pa.float64()),
+    ("Internships", pa.uint8()),
+    ("Projects", pa.uint8()),
+    ("Workshops/Certifications", pa.uint8()),
+    ("AptitudeTestScore", pa.uint8()),
+    ("SoftSkillsRating", pa.float64()),
+    ("ExtracurricularActivities", pa.int8()),
+    ("PlacementTraining", pa.int8()),
+    ("SSC_Marks", pa.float32()),
+    ("HSC_Marks", pa.float32()),
+    ("PlacementStatus", pa.int8()),
+    ("Company_Tier", pa.dictionary(pa.int8(), pa.string())),
+])
+
+def schema_summary() -> dict:
+    return {field.name: str(field.type) for field in SCHEMA}
+
+def output_paths(output_dir: str = OUTPUT_DIR) -> dict:
+    base = os.path.join(output_dir, BASENAME)
+    return {"parquet": f"{base}.parquet", "feather": f"{base}.feather", "manifest": f"{base}.manifest.json"}
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _map_strict(values: pd.Series, mapping: dict, column: str) -> pd.Series:
+    mapped = values.str.strip().str.lower().map(mapping)
+    if mapped.isna().any():
+        bad = sorted(set(values[mapped.isna()].dropna().astype(str)))[:5]
+        raise ValueError(f"Unrecognised {column} values: {bad}")
+    return mapped.astype("int8")
+
+def clean_chunk(df: pd.DataFrame) -> pa.Table:
+    df = df.drop(columns=["StudentID"])
+    for col in FLAG_COLUMNS:
+        df[col] = _map_strict(df[col], YES_NO, col)
+    df["PlacementStatus"] = _map_strict(df["PlacementStatus"], PLACEMENT_STATUS, "PlacementStatus")
+
+    tier = df["Company_Tier"].str.strip()
+    unknown = set(tier.dropna()) - set(TIER_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown Company_Tier values: {sorted(unknown)}")
+    df["Company_Tier"] = pd.Categorical(tier, categories=TIER_CATEGORIES)
+
+    # Fixed categories give every chunk the same dictionary, which the Feather
+    # (IPC file) format requires across record batches
+    return pa.Table.from_pandas(df[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+
+def is_current(source: str = RAW_PATH, output_dir: str = OUTPUT_DIR) -> bool:
+    paths = output_paths(output_dir)
+    if not all(os.path.exists(p) for p in paths.values()):
+        return False
+    with open(paths["manifest"]) as f:
+        manifest = json.load(f)
+    return manifest.get("source_sha256") == file_hash(source) and manifest.get("schema") == schema_summary()
+
+def prepare(source: str = RAW_PATH, output_dir: str = OUTPUT_DIR, force: bool = False,
+            chunk_rows: int = CHUNK_ROWS) -> dict:
+    paths = output_paths(output_dir)
+    # A store written with an older schema is rebuilt even if the source is unchanged
+    if not force and is_current(source, output_dir):
+        with open(paths["manifest"]) as f:
+            return {**json.load(f), "skipped": True}
+    source_hash = file_hash(source)
+
+    start = time.perf_counter()
+    rows = 0
+    os.makedirs(output_dir, exist_ok=True)
+    tmp = {fmt: f"{paths[fmt]}.tmp" for fmt in ["parquet", "feather"]}
+
+    # Written to temporary files and renamed, so readers never see half a store
+    with pq.ParquetWriter(tmp["parquet"], SCHEMA, compression="zstd") as parquet_writer, \
+            ipc.new_file(tmp["feather"], SCHEMA) as feather_writer:
+        for chunk in pd.read_csv(source, dtype=RAW_DTYPES, chunksize=chunk_rows):
+            table = clean_chunk(chunk)
+            parquet_writer.write_table(table)
+            feather_writer.write_table(table)
+            rows += table.num_rows
+
+    for fmt, path in tmp.items():
+        os.replace(path, paths[fmt])
+
+    manifest = {
+        # Relative to the repository, so the manifest is the same on every machine
+        "source": os.path.relpath(source, ROOT),
+        "source_sha256": source_hash,
+        "rows": rows,
+        "schema": schema_summary(),
+        "prepared_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": time.perf_counter() - start,
+    }
+    with open(paths["manifest"], "w") as f:
+        json.dump(manifest, f, indent=2)
+    return {**manifest, "skipped": False}
+
+def load_table(output_dir: str = OUTPUT_DIR, columns: list | None = None) -> pa.Table:
+    # Memory-mapped and zero-copy: the columns stay in the page cache
+    return feather.read_table(output_paths(output_dir)["feather"], columns=columns, memory_map=True)
+
+def load_frame(output_dir: str = OUTPUT_DIR, columns: list | None = None) -> pd.DataFrame:
+    return load_table(output_dir, columns).to_pandas()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the cleaned, dtype-compact dataset store from the raw CSV")
+    parser.add_argument("--source", default=RAW_PATH)
+    parser.add_argument("--out-dir", default=OUTPUT_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source hash is unchanged")
+    args = parser.parse_args()
+
+    try:
+        result = prepare(args.source, args.out_dir, args.force, args.chunk_rows)
+    except ValueError as e:
+        sys.exit(f"Cannot prepare {args.source}: {e}")
+
+    if result["skipped"]:
+        print(f"Up to date: {args.source} unchanged (sha256 {result['source_sha256'][:12]})")
+        return
+    paths = output_paths(args.out_dir)
+    print(f"Prepared {result['rows']:,} rows in {result['seconds']:.2f}s -> "
+          f"{paths['parquet']} ({os.path.getsize(paths['parquet']) / 2**10:,.0f} KiB), "
+          f"{paths['feather']} ({os.path.getsize(paths['feather']) / 2**10:,.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
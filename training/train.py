@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import pickle
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.join(ROOT, "training"))
+os.chdir(ROOT)
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+import prepare_data
+from inference import FEATURE_ORDER, PLACEMENT_MODEL_PATH, TIER_ENCODER_PATH, TIER_MODEL_PATH
+
+# ── Training pipeline ────────────────────────────────────────────────────────
+# Replaces notebooks 02 and 03. Same data split as the notebooks (80/20,
+# stratified, seed 42), but each model's hyperparameters are chosen by
+# stratified k-fold grid search on the training split across all cores, and
+# the held-out 20% is only used for the reported metrics. Data comes from the
+# memory-mapped store built by prepare_data.py, rebuilt first if the raw CSV
+# has changed.
+#
+# Every run writes models/versions/<version>/ with the three pickles and a
+# metadata.json (feature order, best parameters, CV and holdout metrics,
+# training time, data hash, library versions). Unless --no-promote is given,
+# the pickles are then copied to the paths load_models() reads and the
+# .npz/.npy fast-path artifacts are re-exported through the model registry.
+VERSIONS_DIR = "models/versions"
+SEED = 42
+
+PLACEMENT_GRID = {
+    "C": [0.01, 0.1, 1.0, 10.0],
+    "class_weight": [None, "balanced"],
+}
+TIER_GRID = {
+    "n_estimators": [200, 400],
+    "max_depth": [None, 12, 20],
+    "min_samples_leaf": [1, 2, 5],
+    "max_features": ["sqrt", 0.5],
+}
+# --quick: a one-point grid per model, for checking the pipeline end to end
+QUICK_PLACEMENT_GRID = {"C": [1.0]}
+QUICK_TIER_GRID = {"n_estimators": [200]}
+
+def load_dataset(source: str = prepare_data.RAW_PATH) -> tuple[pd.DataFrame, str]:
+    manifest = prepare_data.prepare(source)
+    df = prepare_data.load_frame()
+    # The store keeps compact integer and float32 columns, all of which hold
+    # the CSV values exactly, so the float64 cast restores them unchanged
+    df[FEATURE_ORDER] = df[FEATURE_ORDER].astype(np.float64)
+    return df, manifest["source_sha256"]
+
+def search(estimator, grid: dict, X, y, cv: int, scoring: str) -> GridSearchCV:
+    # Parallelism is at the grid level (n_jobs=-1); estimators stay single-threaded
+    # so candidates do not oversubscribe the cores
+    gs = GridSearchCV(
+        estimator, grid,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=SEED),
+        scoring=scoring, n_jobs=-1, refit=True
+    )
+    gs.fit(X, y)
+    return gs
+
+def train_placement(df: pd.DataFrame, grid: dict, cv: int) -> tuple[LogisticRegression, dict]:
+    X, y = df[FEATURE_ORDER], df["PlacementStatus"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=SEED, stratify=y)
+
+    start = time.perf_counter()
+    # Stays a bare LogisticRegression (no scaler pipeline): PlacementScorer
+    # reads coef_/intercept_ straight off it
+    gs = search(LogisticRegression(max_iter=5000), grid, X_train, y_train, cv, "roc_auc")
+    seconds = time.perf_counter() - start
+
+    model = gs.best_estimator_
+    y_pred = model.predict(X_test)
+    return model, {
+        "best_params": gs.best_params_,
+        "cv_roc_auc": gs.best_score_,
+        "holdout_accuracy": accuracy_score(y_test, y_pred),
+        "holdout_roc_auc": roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]),
+        "holdout_report": classification_report(y_test, y_pred, output_dict=True),
+        "train_rows": len(X_train),
+        "search_seconds": seconds,
+    }
+
+def train_tier(df: pd.DataFrame, grid: dict, cv: int) -> tuple[RandomForestClassifier, LabelEncoder, dict]:
+    placed = df[df["PlacementStatus"] == 1]
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(placed["Company_Tier"].astype(str))
+    X = placed[FEATURE_ORDER]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=SEED, stratify=y)
+
+    start = time.perf_counter()
+    gs = search(RandomForestClassifier(random_state=SEED), grid, X_train, y_train, cv, "accuracy")
+    seconds = time.perf_counter() - start
+
+    model = gs.best_estimator_
+    y_pred = model.predict(X_test)
+    return model, encoder, {
+        "best_params": gs.best_params_,
+        "cv_accuracy": gs.best_score_,
+        "holdout_accuracy": accuracy_score(y_test, y_pred),
+        "holdout_report": classification_report(
+            y_test, y_pred, target_names=[str(c) for c in encoder.classes_], output_dict=True),
+        "train_rows": len(X_train),
+        "search_seconds": seconds,
+    }
+
+def _dump(obj, path: str) -> None:
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+def write_version(out_dir: str, placement, tier, encoder, metadata: dict) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    _dump(placement, os.path.join(out_dir, os.path.basename(PLACEMENT_MODEL_PATH)))
+    _dump(tier, os.path.join(out_dir, os.path.basename(TIER_MODEL_PATH)))
+    _dump(encoder, os.path.join(out_dir, os.path.basename(TIER_ENCODER_PATH)))
+    with open(os.path.join(out_dir, "metadata.json"), "w") as f:
+        json.dump(metadata, f, indent=2, default=_json_default)
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+def promote(version_dir: str) -> None:
+    # Copy into the paths load_models() and the registry read, then rebuild
+    # the placement_scorer.npz and company_tier_forest/ exports from them
+    for path in [PLACEMENT_MODEL_PATH, TIER_MODEL_PATH, TIER_ENCODER_PATH]:
+        shutil.copyfile(os.path.join(version_dir, os.path.basename(path)), path)
+    shutil.copyfile(os.path.join(version_dir, "metadata.json"), os.path.join(os.path.dirname(PLACEMENT_MODEL_PATH), "metadata.json"))
+
+    from model_registry import export_all, registry
+    registry.clear()
+    export_all()
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the placement and company-tier models")
+    parser.add_argument("--data", default=prepare_data.RAW_PATH, help="Raw CSV export")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--quick", action="store_true", help="Single-point grids, to check the pipeline quickly")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Only write models/versions/<version>/; leave the served artifacts alone")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df, data_hash = load_dataset(args.data)
+    print(f"Loaded {len(df):,} rows prepared from {args.data} (sha256 {data_hash[:12]})")
+
+    placement, placement_metrics = train_placement(df, QUICK_PLACEMENT_GRID if args.quick else PLACEMENT_GRID, args.cv)
+    print(f"Placement: {placement_metrics['best_params']} cv AUC {placement_metrics['cv_roc_auc']:.4f}, "
+          f"holdout accuracy {placement_metrics['holdout_accuracy']:.4f} ({placement_metrics['search_seconds']:.1f}s)")
+
+    tier, encoder, tier_metrics = train_tier(df, QUICK_TIER_GRID if args.quick else TIER_GRID, args.cv)
+    print(f"Tier:      {tier_metrics['best_params']} cv accuracy {tier_metrics['cv_accuracy']:.4f}, "
+          f"holdout accuracy {tier_metrics['holdout_accuracy']:.4f} ({tier_metrics['search_seconds']:.1f}s)")
+
+    trained_at = datetime.now(timezone.utc)
+    version = f"{trained_at:%Y%m%dT%H%M%SZ}-{data_hash[:8]}"
+    metadata = {
+        "version": version,
+        "trained_at": trained_at.isoformat(timespec="seconds"),
+        "data_path": args.data,
+        "data_sha256": data_hash,
+        "rows": len(df),
+        "feature_order": FEATURE_ORDER,
+        "tier_classes": [str(c) for c in encoder.classes_],
+        "seed": SEED,
+        "cv_folds": args.cv,
+        "quick": args.quick,
+        "placement": placement_metrics,
+        "tier": tier_metrics,
+        "training_seconds": time.perf_counter() - start,
+        "versions": {
+            "python": platform.python_version(),
+            "scikit-learn": sklearn.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+    }
+
+    version_dir = os.path.join(VERSIONS_DIR, version)
+    write_version(version_dir, placement, tier, encoder, metadata)
+    print(f"Wrote {version_dir}")
+
+    if not args.no_promote:
+        promote(version_dir)
+        print("Promoted to models/ and re-exported the fast-path artifacts")
+
+if __name__ == "__main__":
+    main()